@@ -0,0 +1,173 @@
+"""
+ann_index.py
+Approximate nearest-neighbour retrieval over normalized resume embeddings.
+
+IVFIndex is an inverted-file index implemented with NumPy: resumes are
+clustered with spherical k-means and a query only scans the `n_probe` lists
+whose centroids are closest to it. `n_probe` is the recall/latency knob:
+more lists scanned means higher recall and slower queries. FaissIVFIndex
+exposes the same interface on top of FAISS when it is installed.
+"""
+
+import time
+
+import numpy as np
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, without sorting the whole array."""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def _assign(vectors, centroids, chunk_size=65536):
+    """Index of the closest centroid (by inner product) for every vector."""
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        block = vectors[start:start + chunk_size]
+        assign[start:start + chunk_size] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+def spherical_kmeans(vectors, n_clusters, n_iter=20, seed=42):
+    """Clusters normalized vectors and returns the (n_clusters, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assign = _assign(vectors, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_clusters)
+        starts = np.cumsum(counts) - counts
+        filled = counts > 0
+
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], starts[filled], axis=0)
+        # Empty clusters are re-seeded on random vectors.
+        empty = np.flatnonzero(~filled)
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    def __init__(self, n_lists=None, n_probe=8, max_train_size=100_000, seed=42):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.max_train_size = max_train_size
+        self.seed = seed
+        self.centroids = None
+        self.ids = None
+        self.offsets = None
+        self.list_vectors = None
+
+    def build(self, vectors):
+        """Builds the index over a (n, dim) matrix of L2-normalized vectors."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n = len(vectors)
+        n_lists = self.n_lists or max(1, int(4 * np.sqrt(n)))
+        n_lists = min(n_lists, n)
+
+        rng = np.random.default_rng(self.seed)
+        train = vectors
+        if n > self.max_train_size:
+            train = vectors[rng.choice(n, self.max_train_size, replace=False)]
+        self.centroids = spherical_kmeans(train, n_lists, seed=self.seed)
+
+        # Store every list contiguously so a probe is a single slice.
+        assign = _assign(vectors, self.centroids)
+        self.ids = np.argsort(assign, kind="stable")
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        self.list_vectors = vectors[self.ids]
+        return self
+
+    def search(self, query, k, n_probe=None):
+        """Returns (ids, scores) of the approximate top-k vectors for one query."""
+        query = np.asarray(query, dtype=np.float32)
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probed = top_k_indices(self.centroids @ query, n_probe)
+
+        ids, scores = [], []
+        for lst in probed:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            ids.append(self.ids[start:end])
+            scores.append(self.list_vectors[start:end] @ query)
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+
+        top = top_k_indices(scores, k)
+        return ids[top], scores[top]
+
+
+class FaissIVFIndex:
+    """Same interface as IVFIndex, backed by faiss.IndexIVFFlat (inner product)."""
+
+    def __init__(self, n_lists=None, n_probe=8):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.index = None
+
+    def build(self, vectors):
+        import faiss
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n, dim = vectors.shape
+        n_lists = min(self.n_lists or max(1, int(4 * np.sqrt(n))), n)
+        quantizer = faiss.IndexFlatIP(dim)
+        self.index = faiss.IndexIVFFlat(quantizer, dim, n_lists, faiss.METRIC_INNER_PRODUCT)
+        self.index.train(vectors)
+        self.index.add(vectors)
+        self._quantizer = quantizer  # keep alive: faiss does not own it
+        return self
+
+    def search(self, query, k, n_probe=None):
+        self.index.nprobe = n_probe or self.n_probe
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        scores, ids = self.index.search(query, k)
+        found = ids[0] >= 0
+        return ids[0][found], scores[0][found]
+
+
+def build_index(vectors, backend="numpy", **kwargs):
+    """Builds an ANN index with the "numpy" or "faiss" backend."""
+    if backend == "numpy":
+        return IVFIndex(**kwargs).build(vectors)
+    if backend == "faiss":
+        return FaissIVFIndex(**kwargs).build(vectors)
+    raise ValueError(f"Unknown ANN backend: {backend}")
+
+
+def measure_recall(index, vectors, queries, k=100, n_probe=None):
+    """Compares the index against exact search over the same vectors.
+
+    Returns the mean recall@k and the mean per-query latency of both paths.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    recalls, exact_time, ann_time = [], 0.0, 0.0
+    for query in np.asarray(queries, dtype=np.float32):
+        start = time.perf_counter()
+        exact = top_k_indices(vectors @ query, k)
+        exact_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx, _ = index.search(query, k, n_probe=n_probe)
+        ann_time += time.perf_counter() - start
+
+        recalls.append(len(np.intersect1d(exact, approx)) / max(len(exact), 1))
+
+    n_queries = max(len(recalls), 1)
+    return {
+        "recall": float(np.mean(recalls)) if recalls else 0.0,
+        "exact_ms": 1000 * exact_time / n_queries,
+        "ann_ms": 1000 * ann_time / n_queries,
+    }
@@ -1,16 +1,148 @@
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 
-# Load model
-model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+from ann_index import top_k_indices
+from job_cache import encode_job
+from model_registry import get_model
 
-def match_resumes(job_des, resumes, keywords=None):
+# Words, with inner dots and trailing + or # kept ("node.js", "c++", "c#"), so a
+# keyword like "C++" does not shrink to "c" and hit the "c" of "c'est".
+TOKEN_PATTERN = r"(?u)\w(?:[\w.]*\w)?[+#]*"
+
+# The model is loaded by the registry on first use, not at import time.
+
+def match_resumes(job_des, resumes, keywords=None, store=None, top_k=None, index=None, model=None,
+                  candidates=None):
+    """Ranks resumes by cosine similarity to the job description.
+
+    If an EmbeddingStore is given, resume vectors are read from it and only
+    resumes missing from the store are encoded. With `top_k`, only the best
+    k resumes are returned. With an ANN `index` built over the normalized
+    embeddings of `resumes` (same order), the top-k is retrieved approximately;
+    the index only sees the probed lists, so it is not used when every resume
+    must be ranked (top_k=None) or when `candidates` are given.
+    `candidates` (e.g. from InvertedIndex.candidates) restricts scoring to
+    those positions of `resumes`; the others are never encoded.
+    `model` defaults to the registry's shared model; the job embedding is
+    cached per model (see job_cache.py).
+    """
+    model = model or get_model()
     if keywords:
         job_des = job_des + " " + " ".join(keywords)
 
-    emb_resumes = model.encode(resumes, convert_to_tensor=True)
-    emb_job = model.encode(job_des, convert_to_tensor=True)
+    if index is not None and top_k is not None and candidates is None:
+        emb_job = encode_job(model, job_des)
+        ids, scores = index.search(emb_job, top_k)
+        return [(resumes[i], float(score)) for i, score in zip(ids, scores)]
+
+    if candidates is not None:
+        resumes = [resumes[i] for i in candidates]
+        if not resumes:
+            return []
+
+    if store is not None:
+        emb_job = encode_job(model, job_des)
+        scores = store.scores(resumes, emb_job, model)
+    else:
+        emb_resumes = model.encode(resumes, normalize_embeddings=True, convert_to_numpy=True)
+        emb_job = encode_job(model, job_des)
+        scores = emb_resumes @ emb_job
 
-    scores = util.cos_sim(emb_resumes, emb_job).squeeze().tolist()
-    results = list(zip(resumes, scores))
+    if top_k is not None:
+        return [(resumes[i], float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    results = list(zip(resumes, scores.tolist()))
     results = sorted(results, key=lambda x: x[1], reverse=True)
     return results
+
+def match_resumes_batch(job_descriptions, resumes, keywords=None, top_k=10, chunk_size=64,
+                        store=None, batch_size=64, model=None):
+    """Ranks the same resumes against many job descriptions.
+
+    Jobs and resumes are each encoded once, and the jobs x resumes similarity
+    matrix is computed `chunk_size` jobs at a time, so memory stays bounded by
+    chunk_size x len(resumes). `keywords` is an optional list with one keyword
+    list per job. Yields (job_index, job_description, results) per job, where
+    results is the top_k (resume, score) list, like match_resumes.
+    """
+    model = model or get_model()
+    job_descriptions = list(job_descriptions)
+    job_texts = job_descriptions
+    if keywords is not None:
+        keywords = list(keywords)
+        if len(keywords) != len(job_descriptions):
+            raise ValueError(
+                f"keywords has {len(keywords)} lists for {len(job_descriptions)} job descriptions"
+            )
+        job_texts = [
+            job + " " + " ".join(kws) if kws else job
+            for job, kws in zip(job_descriptions, keywords)
+        ]
+
+    emb_jobs = model.encode(job_texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    if store is not None:
+        emb_resumes = store.embed(resumes, model, batch_size)
+    else:
+        emb_resumes = model.encode(resumes, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+
+    k = len(resumes) if top_k is None else top_k
+    for start in range(0, len(job_texts), chunk_size):
+        sims = emb_jobs[start:start + chunk_size] @ emb_resumes.T
+        for offset, row in enumerate(sims):
+            job_index = start + offset
+            results = [(resumes[i], float(row[i])) for i in top_k_indices(row, k)]
+            yield job_index, job_descriptions[job_index], results
+
+def keyword_matrix(resumes, keywords):
+    """Sparse binary term-document matrix: one row per resume, one column per keyword.
+
+    Keywords may span several words ("bases de données"); texts and keywords go
+    through the same lowercasing tokenizer (TOKEN_PATTERN, which keeps "c++",
+    "c#" and "node.js" whole), so a keyword hits a resume when its token
+    sequence appears in it. Returns the matrix and, for every column, how
+    many of the given keywords normalize to that term.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN)
+    analyze = vectorizer.build_analyzer()
+    counts = {}
+    for keyword in keywords:
+        term = " ".join(analyze(keyword))
+        if term:
+            counts[term] = counts.get(term, 0) + 1
+
+    if not counts:
+        return None, np.zeros(0)
+    max_n = max(term.count(" ") + 1 for term in counts)
+    vectorizer = CountVectorizer(
+        token_pattern=TOKEN_PATTERN,
+        vocabulary=list(counts),
+        ngram_range=(1, max_n),
+        binary=True,
+    )
+    return vectorizer.transform(resumes), np.array(list(counts.values()), dtype=np.float32)
+
+def hybrid_scores(job_des, resumes, job_keywords, semantic_weight=0.7, keyword_weight=0.3, store=None,
+                  model=None):
+    """Scores every resume with a weighted sum of semantic and keyword similarity.
+
+    The job and all resumes are encoded once (through `store` if given), and
+    keyword hits are counted for every resume at once with a sparse matrix.
+    Returns three NumPy arrays: combined, semantic and keyword scores.
+    """
+    model = model or get_model()
+    emb_job = encode_job(model, job_des)
+    if store is not None:
+        semantic = store.scores(resumes, emb_job, model)
+    else:
+        emb_resumes = model.encode(resumes, normalize_embeddings=True, convert_to_numpy=True)
+        semantic = emb_resumes @ emb_job
+
+    hits, weights = keyword_matrix(resumes, job_keywords)
+    if hits is None:
+        keyword = np.zeros(len(resumes), dtype=np.float32)
+    else:
+        keyword = (hits @ weights) / len(job_keywords)
+
+    combined = semantic_weight * semantic + keyword_weight * keyword
+    return combined, semantic, keyword
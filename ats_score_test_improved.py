@@ -1,8 +1,10 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import numpy as np
 
-# Try a different model that's better for semantic similarity
-model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+from ats_score_test import hybrid_scores
+from model_registry import get_model
+
+model = get_model()
 
 resumes = [
     "Développeur logiciel avec 3 ans d'expérience en Python et Django.",
@@ -35,29 +37,17 @@ for rank, (resume, score) in enumerate(results, start=1):
 print("\n" + "="*60)
 
 # Alternative approach using keyword matching + semantic similarity
-def enhanced_matching(resumes, job_description):
+def enhanced_matching(resumes, job_description, job_keywords=None, semantic_weight=0.7, keyword_weight=0.3):
     """Enhanced matching combining semantic similarity with keyword matching"""
     
     # Extract key terms from job description
-    job_keywords = ["python", "django", "développeur", "sql", "bases de données"]
-    
-    enhanced_scores = []
+    if job_keywords is None:
+        job_keywords = ["python", "django", "développeur", "sql", "bases de données"]
     
-    for resume in resumes:
-        # Semantic similarity score
-        resume_emb = model.encode(resume, convert_to_tensor=True, normalize_embeddings=True)
-        job_emb = model.encode(job_description, convert_to_tensor=True, normalize_embeddings=True)
-        semantic_score = util.cos_sim(resume_emb, job_emb).item()
-        
-        # Keyword matching score
-        resume_lower = resume.lower()
-        keyword_matches = sum(1 for keyword in job_keywords if keyword in resume_lower)
-        keyword_score = keyword_matches / len(job_keywords)
-        
-        # Combined score (70% semantic, 30% keyword)
-        combined_score = 0.7 * semantic_score + 0.3 * keyword_score
-        
-        enhanced_scores.append((resume, combined_score, semantic_score, keyword_score))
+    combined, semantic, keyword = hybrid_scores(
+        job_description, resumes, job_keywords, semantic_weight, keyword_weight
+    )
+    enhanced_scores = list(zip(resumes, combined.tolist(), semantic.tolist(), keyword.tolist()))
     
     return sorted(enhanced_scores, key=lambda x: x[1], reverse=True)
 
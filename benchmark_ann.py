@@ -0,0 +1,58 @@
+"""
+benchmark_ann.py
+Measures recall@k and query latency of the ANN index against exact search.
+
+Resumes from the synthetic CV set are encoded once (cached in an
+EmbeddingStore) and indexed; a sample of job descriptions from a pair dataset
+is used as queries, as in match_resumes, and the index is queried for several
+`n_probe` values.
+
+Usage: python benchmark_ann.py [--k 100] [--n-probe 1 4 8 16 32] [--jobs data/exports/a_resume_job_pairs_fr]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from ann_index import build_index, measure_recall
+from benchmark_compression import JOBS_PATH, job_texts
+from embedding_store import EmbeddingStore
+from model_registry import get_model, model_id
+
+CSV_PATH = "data/exports/synthetic_cv_fr.csv"
+STORE_DIR = "data/cache/embeddings"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--jobs", default=JOBS_PATH, help="pair dataset whose job descriptions are the queries")
+    parser.add_argument("--n-queries", type=int, default=100)
+    parser.add_argument("--backend", default="numpy", choices=["numpy", "faiss"])
+    args = parser.parse_args()
+
+    model = get_model()
+    texts = pd.read_csv(args.csv, encoding="utf-8-sig")["resume_text"].tolist()
+    store = EmbeddingStore(STORE_DIR, model_id())
+    corpus = store.embed(texts, model)
+
+    jobs = job_texts(args.jobs)
+    rng = np.random.default_rng(42)
+    jobs = [jobs[i] for i in rng.choice(len(jobs), min(args.n_queries, len(jobs)), replace=False)]
+    queries = model.encode(jobs, normalize_embeddings=True, convert_to_numpy=True)
+
+    index = build_index(corpus, backend=args.backend)
+    print(f"Index over {len(corpus)} resumes, {len(queries)} job queries, k={args.k}")
+    for n_probe in args.n_probe:
+        stats = measure_recall(index, corpus, queries, k=args.k, n_probe=n_probe)
+        print(
+            f"n_probe={n_probe:>3} | recall@{args.k}: {stats['recall']:.3f} "
+            f"| exact: {stats['exact_ms']:.2f} ms | ann: {stats['ann_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+benchmark_compression.py
+Memory per million resumes and ranking drift of each compressed vector
+setting, against the exact float32 cosine ranking of match_resumes.
+
+Resumes from the synthetic CV set are encoded once into an EmbeddingStore;
+the index is built from, and rescored against, its memory-mapped matrix, so
+only the compressed codes are held in memory. Queries are job descriptions
+of a pair dataset. For each setting: bytes per vector, MB per million
+resumes, Spearman correlation of the compressed scores with the exact ones
+(drift), and recall@k of the top-k without and with exact rescoring of the
+top k * rescore candidates.
+
+Usage: python benchmark_compression.py [--k 10] [--rescore 4] [--jobs data/exports/a_resume_job_pairs_fr]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from ann_index import top_k_indices
+from embedding_store import EmbeddingStore
+from model_registry import get_model, model_id
+from pair_dataset import PairDataset, is_dataset
+from vector_compression import (
+    CompressedIndex, Float16Codec, Int8Codec, PCAReducer, PQCodec, TruncateReducer, chunked_dot,
+)
+
+CSV_PATH = "data/exports/synthetic_cv_fr.csv"
+JOBS_PATH = "data/exports/a_resume_job_pairs_fr"
+STORE_DIR = "data/cache/embeddings"
+
+
+def job_texts(path):
+    """Unique job descriptions of a pair_dataset directory or pair CSV."""
+    if is_dataset(path):
+        return PairDataset(path).jobs["job_description"].tolist()
+    return pd.read_csv(path, encoding="utf-8-sig", usecols=["job_description"])["job_description"].unique().tolist()
+
+
+def settings(dim, reduced_dim):
+    return {
+        "float16": lambda: CompressedIndex(Float16Codec()),
+        "int8": lambda: CompressedIndex(Int8Codec()),
+        f"pq{dim // 8}": lambda: CompressedIndex(PQCodec(m=dim // 8)),
+        f"pca{reduced_dim}+float16": lambda: CompressedIndex(Float16Codec(), PCAReducer(reduced_dim)),
+        f"pca{reduced_dim}+int8": lambda: CompressedIndex(Int8Codec(), PCAReducer(reduced_dim)),
+        f"truncate{reduced_dim}+int8": lambda: CompressedIndex(Int8Codec(), TruncateReducer(reduced_dim)),
+        f"pca{reduced_dim}+pq{reduced_dim // 8}": lambda: CompressedIndex(
+            PQCodec(m=reduced_dim // 8), PCAReducer(reduced_dim)
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=4)
+    parser.add_argument("--dim", type=int, default=128, help="reduced dimension for PCA / truncation")
+    parser.add_argument("--jobs", default=JOBS_PATH, help="pair dataset whose job descriptions are the queries")
+    parser.add_argument("--n-queries", type=int, default=100)
+    args = parser.parse_args()
+
+    model = get_model()
+    texts = pd.read_csv(args.csv, encoding="utf-8-sig")["resume_text"].tolist()
+    store = EmbeddingStore(STORE_DIR, model_id())
+    store.rows_for(texts, model)
+    # Every resume of the store, memory-mapped: only the compressed codes are loaded.
+    corpus = store.matrix
+
+    jobs = job_texts(args.jobs)
+    rng = np.random.default_rng(42)
+    jobs = [jobs[i] for i in rng.choice(len(jobs), min(args.n_queries, len(jobs)), replace=False)]
+    queries = model.encode(jobs, normalize_embeddings=True, convert_to_numpy=True)
+    exact_scores = [chunked_dot(corpus, query) for query in queries]
+    exact_top = [top_k_indices(row, args.k) for row in exact_scores]
+
+    full_bytes = corpus.shape[1] * 4
+    print(f"{len(corpus)} resumes ({corpus.shape[1]} dims), {len(queries)} job queries, k={args.k}, "
+          f"rescore x{args.rescore}")
+    print(f"  {'float32':<18} {full_bytes:>5} B/vector {full_bytes * 1e6 / 2 ** 20:>8.1f} MB/M  (reference)")
+    for name, make in settings(corpus.shape[1], args.dim).items():
+        index = make().build(corpus)
+        drift, recall, recall_rescored, ms = [], [], [], 0.0
+        for query, exact, top in zip(queries, exact_scores, exact_top):
+            approx = index.approximate_scores(query)
+            drift.append(spearmanr(approx, exact).correlation)
+            recall.append(len(np.intersect1d(top_k_indices(approx, args.k), top)) / args.k)
+            start = time.perf_counter()
+            ids, _ = index.search(query, args.k, rescore=args.rescore)
+            ms += (time.perf_counter() - start) * 1000
+            recall_rescored.append(len(np.intersect1d(ids, top)) / args.k)
+        per_vector = index.bytes_per_vector()
+        print(
+            f"  {name:<18} {per_vector:>5.0f} B/vector {per_vector * 1e6 / 2 ** 20:>8.1f} MB/M"
+            f" | Spearman {np.mean(drift):.4f} | recall@{args.k} {np.mean(recall):.3f}"
+            f" -> {np.mean(recall_rescored):.3f} rescored | {ms / len(queries):.2f} ms/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+benchmark_onnx.py
+Compares the PyTorch fp32 model with the ONNX Runtime int8 backend on the
+synthetic CV set: resumes encoded per second and ranking agreement
+(Spearman correlation of the scores, top-10 overlap) over a few job queries.
+
+Usage: python benchmark_onnx.py [--model NAME_OR_DIR] [--n 2000] [--threads 1]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from ann_index import top_k_indices
+from model_registry import default_model_name, get_model, onnx_dir
+from onnx_backend import OnnxEncoder
+
+CSV_PATH = "data/exports/synthetic_cv_fr.csv"
+
+JOBS = [
+    "Nous recherchons un développeur Python avec expérience en Django et bases de données SQL.",
+    "Entreprise française recrute un data scientist expérimenté : Python, Pandas, scikit-learn, TensorFlow.",
+    "Offre d'emploi : Ingénieur DevOps – Docker, Kubernetes, CI/CD et Linux.",
+    "Nous recherchons un développeur full-stack React et Java pour rejoindre notre équipe.",
+    "Chef de projet IT en méthodes agiles (Scrum), expérience souhaitée : 5 ans.",
+    "Ingénieur Machine Learning PyTorch pour la mise en production de modèles de classification.",
+]
+
+
+def timed_encode(model, texts, batch_size):
+    start = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    return embeddings, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=default_model_name())
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=1, help="CPU threads for both backends")
+    args = parser.parse_args()
+
+    import torch
+
+    torch.set_num_threads(args.threads)
+    texts = pd.read_csv(args.csv, encoding="utf-8-sig")["resume_text"].tolist()[:args.n]
+
+    fp32 = get_model(args.model, device="cpu", backend="torch")
+    get_model(args.model, backend="onnx")  # exports on first use
+    int8 = OnnxEncoder(onnx_dir(args.model), num_threads=args.threads)
+
+    # Warm-up, then time a full pass over the resumes.
+    fp32.encode(texts[:args.batch_size])
+    int8.encode(texts[:args.batch_size])
+    emb_fp32, t_fp32 = timed_encode(fp32, texts, args.batch_size)
+    emb_int8, t_int8 = timed_encode(int8, texts, args.batch_size)
+
+    print(f"📄 {len(texts)} resumes, {args.threads} thread(s)")
+    print(f"  torch fp32 : {len(texts) / t_fp32:8.1f} resumes/s")
+    print(f"  onnx int8  : {len(texts) / t_int8:8.1f} resumes/s  (x{t_fp32 / t_int8:.2f})")
+
+    jobs_fp32 = fp32.encode(JOBS, normalize_embeddings=True, convert_to_numpy=True)
+    jobs_int8 = int8.encode(JOBS, normalize_embeddings=True, convert_to_numpy=True)
+    spearman, overlap = [], []
+    for job_fp32, job_int8 in zip(jobs_fp32, jobs_int8):
+        scores_fp32 = emb_fp32 @ job_fp32
+        scores_int8 = emb_int8 @ job_int8
+        spearman.append(spearmanr(scores_fp32, scores_int8).correlation)
+        top_fp32 = top_k_indices(scores_fp32, 10)
+        top_int8 = top_k_indices(scores_int8, 10)
+        overlap.append(len(np.intersect1d(top_fp32, top_int8)) / 10)
+
+    print(f"  ranking agreement over {len(JOBS)} jobs:")
+    print(f"    Spearman     : mean {np.mean(spearman):.4f} | min {np.min(spearman):.4f}")
+    print(f"    top-10 overlap: mean {np.mean(overlap):.2f} | min {np.min(overlap):.2f}")
+
+
+if __name__ == "__main__":
+    main()
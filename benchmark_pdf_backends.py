@@ -0,0 +1,112 @@
+"""
+benchmark_pdf_backends.py
+Compares PDF text extraction throughput of every backend in utils_file_text.
+
+Runs on data/resume/1.pdf and on synthetic multi-page CV PDFs written to a
+temporary directory, with and without a page cap.
+
+Usage: python benchmark_pdf_backends.py [--repeat 5] [--pages 2 8 20]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from utils_file_text import PDF_READERS, read_pdf
+
+SAMPLE_PDF = "data/resume/1.pdf"
+
+CV_LINES = [
+    "Prénom/Nom: Camille Durand",
+    "Titre: Développeur Python",
+    "Profil: 6 ans d'expérience dans le domaine informatique.",
+    "Compétences: Python, Django, Docker, SQL, Git, Linux",
+    "Expérience:",
+    "- Conception et développement d'une API REST pour la scalabilité.",
+    "- Optimisation d'un pipeline ETL entraînant une réduction de 20% des coûts.",
+    "Formation:",
+    "Master Informatique, Université Paris-Saclay",
+]
+
+
+def _pdf_string(text):
+    text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return "(" + text + ")"
+
+
+def write_synthetic_pdf(path, num_pages, lines_per_page=50):
+    """Writes a minimal text-only PDF (Helvetica, WinAnsiEncoding)."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in range(num_pages):
+        lines = [f"{CV_LINES[i % len(CV_LINES)]} (page {page + 1})" for i in range(lines_per_page)]
+        stream = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join(f"{_pdf_string(line)} Tj T*" for line in lines) + " ET"
+        stream = stream.encode("cp1252", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % num_pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def bench(reader, path, repeat, max_pages):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = reader(path, max_pages)
+    elapsed = (time.perf_counter() - start) / repeat
+    return elapsed, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 8, 20])
+    parser.add_argument("--max-pages", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [(os.path.basename(SAMPLE_PDF), SAMPLE_PDF)] if os.path.exists(SAMPLE_PDF) else []
+        for num_pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{num_pages}p.pdf")
+            write_synthetic_pdf(path, num_pages)
+            files.append((f"synthetic {num_pages} pages", path))
+
+        readers = dict(PDF_READERS, auto=lambda path, max_pages: read_pdf(path, "auto", max_pages))
+        for label, path in files:
+            print(f"\n📄 {label}")
+            for max_pages in (None, args.max_pages):
+                for name, reader in readers.items():
+                    try:
+                        elapsed, chars = bench(reader, path, args.repeat, max_pages)
+                    except ImportError as e:
+                        print(f"  {name:<10} | not installed ({e.name})")
+                        continue
+                    cap = f"≤{max_pages}p" if max_pages else "all"
+                    print(
+                        f"  {name:<10} | pages: {cap:<4} | {1 / elapsed:8.1f} files/s "
+                        f"| {1000 * elapsed:8.2f} ms/file | {chars} chars"
+                    )
+
+
+if __name__ == "__main__":
+    main()
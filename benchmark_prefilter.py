@@ -0,0 +1,94 @@
+"""
+benchmark_prefilter.py
+Measures what the inverted-index prefilter saves and what it loses on a
+synthetic pair dataset (pair_dataset directory or pair CSV).
+
+For every job, resumes are ranked by match_resumes over the full pool and
+over the prefiltered candidates (keywords: the job's "Compétences requises").
+Reported: candidate share, latency of both paths, recall of the relevant
+resumes (label >= 0.5) kept by the filter, and top-k overlap with the
+unfiltered ranking.
+
+Usage: python benchmark_prefilter.py [--data data/exports/a_resume_job_pairs_fr] [--min-overlap 1] [--bm25 2.0]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ats_score_test import match_resumes
+from evaluation import RELEVANCE_THRESHOLD
+from inverted_index import InvertedIndex, required_skills
+from model_registry import get_model
+from pair_dataset import PairDataset, is_dataset
+from training_data import load_split
+
+DATA_PATH = "data/exports/a_resume_job_pairs_fr"
+
+
+def load_pool(path):
+    """(resume texts, job texts, labels[job, resume]) of a pair dataset."""
+    if is_dataset(path):
+        dataset = PairDataset(path)
+        resumes, jobs = dataset.resumes, dataset.jobs
+        resume_ids, job_ids, scores = dataset.resume_ids, dataset.job_ids, dataset.scores
+    else:
+        df = load_split(path, None)
+        resumes = df.drop_duplicates("resume_id").sort_values("resume_id")
+        jobs = df.drop_duplicates("job_id").sort_values("job_id")
+        resume_ids, job_ids, scores = df["resume_id"], df["job_id"], df["score"]
+    resume_pos = np.searchsorted(resumes["resume_id"].to_numpy(), np.asarray(resume_ids))
+    job_pos = np.searchsorted(jobs["job_id"].to_numpy(), np.asarray(job_ids))
+    labels = np.zeros((len(jobs), len(resumes)), dtype=np.float32)
+    labels[job_pos, resume_pos] = np.asarray(scores, dtype=np.float32)
+    return resumes["resume_text"].tolist(), jobs["job_description"].tolist(), labels
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--n-jobs", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-overlap", type=int, default=1)
+    parser.add_argument("--bm25", type=float, default=None, help="BM25 threshold instead of min overlap")
+    args = parser.parse_args()
+
+    resumes, jobs, labels = load_pool(args.data)
+    model = get_model()
+
+    start = time.perf_counter()
+    index = InvertedIndex()
+    index.add_many(resumes)
+    print(f"📇 Indexed {len(index)} resumes in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    shares, recalls, overlaps, full_ms, filtered_ms = [], [], [], [], []
+    for j in range(min(args.n_jobs, len(jobs))):
+        keywords = required_skills(jobs[j])
+
+        start = time.perf_counter()
+        full = match_resumes(jobs[j], resumes, keywords, top_k=args.k, model=model)
+        full_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        candidates = index.candidates(keywords, args.min_overlap, args.bm25)
+        filtered = match_resumes(jobs[j], resumes, keywords, top_k=args.k, model=model, candidates=candidates)
+        filtered_ms.append((time.perf_counter() - start) * 1000)
+
+        relevant = np.flatnonzero(labels[j] >= RELEVANCE_THRESHOLD)
+        shares.append(len(candidates) / len(resumes))
+        if len(relevant):
+            recalls.append(np.isin(relevant, candidates).mean())
+        overlaps.append(len({r for r, _ in full} & {r for r, _ in filtered}) / max(len(full), 1))
+
+    rule = f"BM25 >= {args.bm25}" if args.bm25 is not None else f"overlap >= {args.min_overlap}"
+    print(f"🔎 {len(full_ms)} jobs, {len(resumes)} resumes, filter: {rule}")
+    print(f"  candidates     : {np.mean(shares) * 100:.1f}% of the pool")
+    print(f"  latency        : full {np.mean(full_ms):.1f} ms | prefiltered {np.mean(filtered_ms):.1f} ms "
+          f"(x{np.mean(full_ms) / max(np.mean(filtered_ms), 1e-9):.1f})")
+    print(f"  relevant kept  : {np.mean(recalls):.3f} (label >= {RELEVANCE_THRESHOLD})")
+    print(f"  top-{args.k} overlap : {np.mean(overlaps):.3f}")
+
+
+if __name__ == "__main__":
+    main()
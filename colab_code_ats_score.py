@@ -1,16 +1,16 @@
 # finetune_ats_ranking.py - CORRECTED SCRIPT
 
-import pandas as pd
-import os
-from sklearn.model_selection import train_test_split
-from sentence_transformers import SentenceTransformer, InputExample, losses
+from sentence_transformers import SentenceTransformer, losses
 from torch.utils.data import DataLoader
 from sentence_transformers.evaluation import EmbeddingSimilarityEvaluator
 from datetime import datetime
 
+from token_cache import install_token_cache, open_token_cache, pretokenize_dataset
+from training_data import PairStream, count_pairs, load_split
+
 # --- Configuration ---
 MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
-# IMPORTANT: This path must point to your 100k generated CSV
+# IMPORTANT: This path must point to your 100k generated CSV (or its pair_dataset directory)
 DATASET_PATH = 'data/exports/resume_job_pairs_fr.csv'
 OUTPUT_DIR = f'output/ats-finetuned-ranking-{datetime.now().strftime("%Y%m%d-%H%M")}'
 
@@ -21,30 +21,28 @@ NUM_EPOCHS = 1
 TRAIN_BATCH_SIZE = 64
 LEARNING_RATE = 2e-5
 
-# Calculate steps for WARMUP_STEPS
-df_size = len(pd.read_csv(DATASET_PATH))
-TOTAL_STEPS = int(df_size * 0.8 / TRAIN_BATCH_SIZE * NUM_EPOCHS)
+SHUFFLE_BUFFER = 10_000
+MAX_EVAL_PAIRS = 20_000
+
+# Calculate steps for WARMUP_STEPS (row counts are cached, texts are not read)
+train_size = count_pairs(DATASET_PATH, 'train')
+TOTAL_STEPS = int(train_size / TRAIN_BATCH_SIZE * NUM_EPOCHS)
 WARMUP_STEPS = int(TOTAL_STEPS * 0.1)
 EVAL_STEPS = 2000 # Evaluate every 2000 steps
 
 # --- 1. Load and Prepare Data ---
 
 def prepare_data(data_path):
-    """Loads the dataset and splits it into train/val/test sets."""
+    """Streams the train split from disk and loads the (capped) validation/test splits."""
     print(f"Loading data from {data_path}...")
-    df = pd.read_csv(data_path)
 
-    # Split: 80% Train, 10% Validation, 10% Test
-    train_df, temp_df = train_test_split(df, test_size=0.2, random_state=42)
-    val_df, test_df = train_test_split(temp_df, test_size=0.5, random_state=42)
+    # Split: 80% Train, 10% Validation, 10% Test, by a hash of (resume_id, job_id)
+    train_examples = PairStream(data_path, split='train', shuffle=True, buffer_size=SHUFFLE_BUFFER)
+    val_df = load_split(data_path, 'val', max_pairs=MAX_EVAL_PAIRS)
+    test_df = load_split(data_path, 'test', max_pairs=MAX_EVAL_PAIRS)
 
-    print(f"Total Pairs: {len(df)} | Train: {len(train_df)} | Validation: {len(val_df)} | Test: {len(test_df)}")
-
-    # Convert DataFrames to a list of InputExample objects
-    train_examples = [
-        InputExample(texts=[row['resume_text'], row['job_description']], label=float(row['score']))
-        for index, row in train_df.iterrows()
-    ]
+    print(f"Total Pairs: {count_pairs(data_path)} | Train: {len(train_examples)} | "
+          f"Validation: {count_pairs(data_path, 'val')} | Test: {count_pairs(data_path, 'test')}")
     return train_examples, val_df, test_df
 
 # --- 2. Setup Model, Loss, and Dataloader (CORRECTED FUNCTION) ---
@@ -54,11 +52,17 @@ def setup_training(train_examples, val_df):
     print(f"\nLoading model: {MODEL_NAME}")
     model = SentenceTransformer(MODEL_NAME)
 
-    # **FIX APPLIED HERE:** Pass the list of InputExample objects directly to DataLoader.
+    # Pre-tokenization: each unique text is tokenized once and cached on disk,
+    # so later runs with other hyperparameters skip tokenization entirely.
+    token_cache = open_token_cache(model)
+    pretokenize_dataset(model, DATASET_PATH, token_cache)
+    install_token_cache(model, token_cache)
+
+    # **FIX APPLIED HERE:** Pass the streamed InputExample objects directly to DataLoader.
     # The MultipleNegativesRankingLoss handles the internal SentencesDataset conversion.
+    # PairStream shuffles through its own buffer, so no shuffle=True here.
     train_dataloader = DataLoader(
-        train_examples, 
-        shuffle=True, 
+        train_examples,
         batch_size=TRAIN_BATCH_SIZE
     )
 
@@ -83,7 +87,10 @@ def fine_tune(model, train_dataloader, train_loss, evaluator):
     print(f"Epochs: {NUM_EPOCHS}, Batch Size: {TRAIN_BATCH_SIZE}, Total Steps: {TOTAL_STEPS}")
     print(f"Warmup Steps: {WARMUP_STEPS}, Evaluate Every: {EVAL_STEPS} steps.")
 
-    model.fit(
+    # old_fit iterates the DataLoader batch by batch; fit (sentence-transformers >= 3)
+    # would first copy every pair into a datasets.Dataset.
+    fit = getattr(model, 'old_fit', model.fit)
+    fit(
         train_objectives=[(train_dataloader, train_loss)],
         evaluator=evaluator,
         epochs=NUM_EPOCHS,
@@ -0,0 +1,165 @@
+"""
+embedding_store.py
+On-disk cache of resume embeddings, so that scoring a new job only encodes the
+resumes that were never seen before.
+
+Layout of a store directory:
+    vectors.f32   raw float32 matrix, one L2-normalized row per resume (memory-mapped)
+    index.json    sidecar metadata: model name and vector dimension
+    keys.log      append-only key log, one line per row (vectors are written first)
+
+Rows are keyed by a SHA-256 of the model name and the resume text, so an edited
+resume simply gets a new row and vectors from another model are never mixed in.
+A custom `encode_fn(model, texts, batch_size)` (e.g. the chunked
+encoding_pipeline) produces different vectors, so give such a store its own
+model name, e.g. f"{model_id()}#chunked". The store assumes a single writer
+process. Adding rows appends to keys.log, so the cost of an append does not
+grow with the size of the store.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.json"
+KEYS_FILE = "keys.log"
+
+
+def content_key(text, model_name):
+    """Returns the store key of a resume text for a given model."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+def read_key_log(path):
+    """Complete lines of an append-only log, split on spaces, and the byte size they span.
+
+    A partial last line (interrupted write) is ignored; append_key_log cuts it off.
+    """
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, "rb") as f:
+        data = f.read()
+    size = data.rfind(b"\n") + 1
+    return [line.split(" ") for line in data[:size].decode("ascii").splitlines()], size
+
+
+def append_key_log(path, lines, size):
+    """Appends lines after the first `size` valid bytes of a log. Returns the new valid size."""
+    data = "".join(f"{line}\n" for line in lines).encode("ascii")
+    with open(path, "ab") as f:
+        f.truncate(size)
+        f.write(data)
+    return size + len(data)
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class EmbeddingStore:
+    def __init__(self, directory, model_name, encode_fn=None):
+        self.directory = directory
+        self.model_name = model_name
+        self.encode_fn = encode_fn
+        self.vectors_path = os.path.join(directory, VECTORS_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.keys_path = os.path.join(directory, KEYS_FILE)
+        self.dim = None
+        self.keys = []
+        self._rows = {}
+        self._matrix = None
+        self._log_size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["model_name"] != model_name:
+                raise ValueError(
+                    f"Store {directory} was built with {meta['model_name']}, not {model_name}."
+                )
+            self.dim = meta["dim"]
+            lines, self._log_size = read_key_log(self.keys_path)
+            self.keys = [fields[0] for fields in lines]
+            self._rows = {key: row for row, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def matrix(self):
+        """Memory-mapped (n, dim) float32 matrix of every stored vector."""
+        if self._matrix is None and self.keys:
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.keys), self.dim)
+            )
+        return self._matrix
+
+    def rows_for(self, texts, model, batch_size=64):
+        """Returns the store row of every text, encoding only the texts not stored yet."""
+        keys = [content_key(text, self.model_name) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        if missing:
+            if self.encode_fn is not None:
+                vectors = self.encode_fn(model, list(missing.values()), batch_size)
+            else:
+                vectors = model.encode(
+                    list(missing.values()),
+                    batch_size=batch_size,
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                )
+            self._append(list(missing), vectors)
+
+        return np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    def embed(self, texts, model, batch_size=64):
+        """Returns the (len(texts), dim) matrix of normalized embeddings."""
+        rows = self.rows_for(texts, model, batch_size)
+        if len(rows) == 0:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self.matrix[rows])
+
+    def scores(self, texts, job_embedding, model, batch_size=64):
+        """Cosine similarity of every text against a normalized job embedding."""
+        rows = self.rows_for(texts, model, batch_size)
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.float32)
+        job_embedding = np.asarray(job_embedding, dtype=np.float32)
+        # Score against the whole mapped matrix and pick the requested rows, so the
+        # vectors are streamed from the page cache instead of being gathered first.
+        return (self.matrix @ job_embedding)[rows]
+
+    def _append(self, keys, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._save_index()
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {vectors.shape[1]}.")
+
+        # Drop the current map before the file grows. Rows written after the last
+        # logged key (e.g. after a crash) are cut off before appending.
+        self._matrix = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(len(self.keys) * self.dim * vectors.itemsize)
+            f.write(vectors.tobytes())
+
+        # Keys go to the log only once their vectors are written.
+        self._log_size = append_key_log(self.keys_path, keys, self._log_size)
+        for key in keys:
+            self._rows[key] = len(self.keys)
+            self.keys.append(key)
+
+    def _save_index(self):
+        write_json(self.index_path, {"model_name": self.model_name, "dim": self.dim})
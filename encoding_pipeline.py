@@ -0,0 +1,93 @@
+"""
+encoding_pipeline.py
+Length-bucketed, token-budgeted encoding for long resumes.
+
+The model silently truncates texts past its max sequence length (128 tokens
+for paraphrase-multilingual-MiniLM-L12-v2), which drops the end of a CV,
+often the skills section. encode_texts() instead:
+1. splits texts longer than the model window into overlapping token chunks;
+2. sorts all chunks by token length and groups them into batches whose padded
+   size (batch size x longest chunk) stays under a token budget, so short
+   texts are batched wide and little compute is spent on padding;
+3. pools the chunk embeddings of each text (mean or max) back into one
+   normalized vector.
+
+Works with a SentenceTransformer or an OnnxEncoder (anything exposing
+`tokenizer`, `max_seq_length` and `encode`). `store_encode_fn` plugs it into
+an EmbeddingStore.
+"""
+
+import numpy as np
+
+
+def chunk_token_ids(ids, window, overlap):
+    """Splits a token id list into windows of `window` ids sharing `overlap` ids."""
+    if len(ids) <= window:
+        return [ids]
+    step = window - overlap
+    return [ids[start:start + window] for start in range(0, len(ids) - overlap, step)]
+
+
+def length_batches(lengths, token_budget, max_batch_size):
+    """Groups item indices, sorted by length, into batches under the padded token budget."""
+    order = np.argsort(lengths, kind="stable")
+    batches, current = [], []
+    for i in order:
+        # Ascending order: the new item is the longest of the batch.
+        if current and (len(current) == max_batch_size or (len(current) + 1) * lengths[i] > token_budget):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def encode_texts(model, texts, token_budget=8192, max_batch_size=128, overlap=32, pooling="mean"):
+    """Encodes texts of any length into a (len(texts), dim) matrix of normalized vectors."""
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    tokenizer = model.tokenizer
+    window = model.max_seq_length - 2  # room for the special tokens
+    overlap = min(overlap, window // 2)
+    token_ids = tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]
+
+    chunks, owners, lengths = [], [], []
+    for i, (text, ids) in enumerate(zip(texts, token_ids)):
+        pieces = chunk_token_ids(ids, window, overlap)
+        if len(pieces) == 1:
+            chunks.append(text)
+        else:
+            chunks.extend(tokenizer.decode(piece) for piece in pieces)
+        owners.extend([i] * len(pieces))
+        lengths.extend(len(piece) + 2 for piece in pieces)
+
+    embeddings = None
+    for batch in length_batches(lengths, token_budget, max_batch_size):
+        batch_emb = model.encode(
+            [chunks[i] for i in batch],
+            batch_size=len(batch),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        if embeddings is None:
+            embeddings = np.empty((len(chunks), batch_emb.shape[1]), dtype=np.float32)
+        embeddings[batch] = batch_emb
+
+    owners = np.asarray(owners)
+    if pooling == "max":
+        pooled = np.full((len(texts), embeddings.shape[1]), -np.inf, dtype=np.float32)
+        np.maximum.at(pooled, owners, embeddings)
+    elif pooling == "mean":
+        pooled = np.zeros((len(texts), embeddings.shape[1]), dtype=np.float32)
+        np.add.at(pooled, owners, embeddings)
+    else:
+        raise ValueError(f"Unknown pooling: {pooling}")
+    pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+    return pooled
+
+
+def store_encode_fn(model, texts, batch_size):
+    """encode_fn for EmbeddingStore: chunked, mean-pooled encoding."""
+    return encode_texts(model, texts, max_batch_size=batch_size)
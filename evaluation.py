@@ -0,0 +1,100 @@
+"""
+evaluation.py
+Batched evaluation of a similarity model on labelled resume–job pairs.
+
+Each unique resume and job text is encoded once, however many pairs it
+appears in. Only the paired similarities are computed, row by row, never
+the N x N similarity matrix. Reported metrics:
+    pearson / spearman       correlation of cosine similarity with the labels
+    ndcg@k                   per job, with the labels as graded relevance
+    mrr, recall@k            per job, pairs with label >= relevance_threshold are relevant
+    texts_per_s              encode throughput over the unique texts
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr, spearmanr
+
+RELEVANCE_THRESHOLD = 0.5
+
+
+def encode_unique(model, texts, batch_size=64):
+    """Encodes the unique texts. Returns (codes, embeddings, seconds) with embeddings[codes[i]] for texts[i]."""
+    codes, uniques = pd.factorize(pd.Series(texts), sort=False)
+    start = time.perf_counter()
+    embeddings = model.encode(
+        list(uniques), batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+    )
+    return codes, embeddings, time.perf_counter() - start
+
+
+def paired_cosine(a, b, a_rows, b_rows, chunk_size=65536):
+    """sims[i] = a[a_rows[i]] . b[b_rows[i]] for normalized rows, computed in chunks."""
+    sims = np.empty(len(a_rows), dtype=np.float32)
+    for start in range(0, len(a_rows), chunk_size):
+        stop = start + chunk_size
+        sims[start:stop] = np.einsum("ij,ij->i", a[a_rows[start:stop]], b[b_rows[start:stop]])
+    return sims
+
+
+def _dcg(gains):
+    return float(np.sum(gains / np.log2(np.arange(2, len(gains) + 2))))
+
+
+def ranking_metrics(job_codes, sims, labels, k=10, relevance_threshold=RELEVANCE_THRESHOLD):
+    """Mean NDCG@k, MRR and recall@k over jobs, ranking each job's resumes by similarity."""
+    order = np.argsort(job_codes, kind="stable")
+    boundaries = np.flatnonzero(np.diff(job_codes[order])) + 1
+    ndcgs, rrs, recalls = [], [], []
+    for group in np.split(order, boundaries):
+        ranked = labels[group[np.argsort(-sims[group], kind="stable")]]
+        ideal = _dcg(np.sort(labels[group])[::-1][:k])
+        if ideal > 0:
+            ndcgs.append(_dcg(ranked[:k]) / ideal)
+        relevant = ranked >= relevance_threshold
+        if relevant.any():
+            rrs.append(1.0 / (np.argmax(relevant) + 1))
+            recalls.append(relevant[:k].sum() / relevant.sum())
+    return {
+        f"ndcg@{k}": float(np.mean(ndcgs)) if ndcgs else float("nan"),
+        "mrr": float(np.mean(rrs)) if rrs else float("nan"),
+        f"recall@{k}": float(np.mean(recalls)) if recalls else float("nan"),
+        "jobs": len(np.split(order, boundaries)) if len(order) else 0,
+    }
+
+
+def evaluate_pairs(model, resume_texts, job_texts, labels, k=10, batch_size=64,
+                   relevance_threshold=RELEVANCE_THRESHOLD):
+    """Evaluates `model` on aligned lists of resume texts, job texts and labels."""
+    labels = np.asarray(labels, dtype=np.float64)
+    resume_codes, resume_emb, resume_s = encode_unique(model, resume_texts, batch_size)
+    job_codes, job_emb, job_s = encode_unique(model, job_texts, batch_size)
+    sims = paired_cosine(resume_emb, job_emb, resume_codes, job_codes)
+
+    metrics = {
+        "pairs": len(labels),
+        "unique_texts": len(resume_emb) + len(job_emb),
+        "pearson": float(pearsonr(sims, labels)[0]),
+        "spearman": float(spearmanr(sims, labels).correlation),
+        "texts_per_s": (len(resume_emb) + len(job_emb)) / max(resume_s + job_s, 1e-9),
+    }
+    metrics.update(ranking_metrics(job_codes, sims, labels, k, relevance_threshold))
+    return metrics
+
+
+def evaluate_frame(model, df, k=10, batch_size=64, relevance_threshold=RELEVANCE_THRESHOLD):
+    """evaluate_pairs over a pair DataFrame (resume_text, job_description, score)."""
+    return evaluate_pairs(
+        model, df["resume_text"].tolist(), df["job_description"].tolist(), df["score"].to_numpy(),
+        k, batch_size, relevance_threshold,
+    )
+
+
+def print_report(metrics, label_name="Evaluation"):
+    print(f"📈 {label_name}: {metrics['pairs']} pairs, {metrics['jobs']} jobs, "
+          f"{metrics['unique_texts']} unique texts ({metrics['texts_per_s']:.1f} texts/s)")
+    for name, value in metrics.items():
+        if name not in ("pairs", "jobs", "unique_texts", "texts_per_s"):
+            print(f"    {name:<10}: {value:.4f}")
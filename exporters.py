@@ -0,0 +1,138 @@
+"""
+exporters.py
+Streaming exporters for ranking results.
+
+Every writer consumes an iterator of row dicts and writes rows as they come,
+so exporting multi-job, million-row rankings runs in constant memory:
+    write_csv          CSV, header taken from the first row's keys (or `fieldnames`)
+    write_jsonl        JSON Lines, one object per line
+    write_json_array   a JSON array written element by element
+    write_parquet      Parquet in row groups of `batch_size` rows (needs pyarrow)
+
+iter_result_rows / iter_batch_rows turn the output of match_resumes /
+match_resumes_batch into such rows lazily; export_batch streams
+match_resumes_batch output to any of the formats above.
+"""
+
+import csv
+import itertools
+import json
+import os
+
+RESULT_FIELDS = ["rank", "score", "resume"]
+BATCH_FIELDS = ["job"] + RESULT_FIELDS
+
+
+def iter_result_rows(results):
+    """Rows {"rank", "score", "resume"} from (resume, score) pairs, best first."""
+    for rank, (resume, score) in enumerate(results, start=1):
+        yield {"rank": rank, "score": round(float(score), 4), "resume": resume}
+
+
+def iter_batch_rows(batch_results):
+    """Rows {"job", "rank", "score", "resume"} from match_resumes_batch output."""
+    for job_index, _, results in batch_results:
+        for row in iter_result_rows(results):
+            yield {"job": job_index, **row}
+
+
+def export_batch(batch_results, filename):
+    """Streams match_resumes_batch output to .csv, .json, .jsonl or .parquet, one row per (job, resume).
+
+    Returns the number of rows written.
+    """
+    if os.path.splitext(filename)[1].lower() == ".csv":
+        return write_csv(iter_batch_rows(batch_results), filename, BATCH_FIELDS)
+    return export_rows(iter_batch_rows(batch_results), filename)
+
+
+def _ensure_parent(filename):
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+
+def write_csv(rows, filename, fieldnames=None):
+    """Writes rows as CSV (capitalized header, scores with 4 decimals). Returns the row count.
+
+    The header comes from `fieldnames`, else from the first row's keys; with
+    `fieldnames`, it is written even when there are no rows.
+    """
+    _ensure_parent(filename)
+    rows = iter(rows)
+    first = next(rows, None)
+    count = 0
+    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        keys = list(fieldnames) if fieldnames is not None else list(first or [])
+        if keys:
+            writer.writerow([key.capitalize() for key in keys])
+        if first is None:
+            return 0
+        for row in itertools.chain([first], rows):
+            writer.writerow([f"{row[k]:.4f}" if isinstance(row[k], float) else row[k] for k in keys])
+            count += 1
+    return count
+
+
+def write_jsonl(rows, filename):
+    _ensure_parent(filename)
+    count = 0
+    with open(filename, "w", encoding="utf-8") as file:
+        for row in rows:
+            file.write(json.dumps(row, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+    return count
+
+
+def write_json_array(rows, filename):
+    _ensure_parent(filename)
+    count = 0
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("[")
+        for row in rows:
+            file.write(",\n" if count else "\n")
+            file.write(json.dumps(row, ensure_ascii=False))
+            count += 1
+        file.write("\n]\n")
+    return count
+
+
+def write_parquet(rows, filename, batch_size=65536):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    _ensure_parent(filename)
+    rows = iter(rows)
+    writer = None
+    count = 0
+    try:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            table = pa.Table.from_pylist(batch, schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(filename, table.schema)
+            writer.write_table(table)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+WRITERS = {
+    ".csv": write_csv,
+    ".jsonl": write_jsonl,
+    ".json": write_json_array,
+    ".parquet": write_parquet,
+}
+
+
+def export_rows(rows, filename):
+    """Streams rows to `filename`, picking the writer from its extension."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unsupported export format: {ext}")
+    return WRITERS[ext](rows, filename)
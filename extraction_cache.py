@@ -0,0 +1,119 @@
+"""
+extraction_cache.py
+Persistent cache of text extracted from resume files (SQLite).
+
+Entries are keyed by path and by the extractor settings that produced the
+text (e.g. PDF backend and page cap, see utils_file_text.extractor_settings),
+and validated against the file's size, mtime and SHA-256 content hash:
+- same size and mtime: cached text is returned without reading the file;
+- touched but identical content (same hash): cached text is returned;
+- renamed or copied file whose content is already cached: text is reused;
+- anything else, including other extractor settings, is a miss and the file
+  must be parsed again.
+With content=False, lookup() stops after the size/mtime check, so a caller
+that parses misses in worker processes does not hash files serially.
+"""
+
+import hashlib
+import os
+import sqlite3
+
+CACHE_PATH = "data/cache/extracted_text.sqlite"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """(size, mtime_ns, sha256) of a file, taken before it is parsed."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, file_sha256(path)
+
+
+class ExtractionCache:
+    def __init__(self, path=CACHE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS extracted (
+                path TEXT,
+                settings TEXT,
+                size INTEGER,
+                mtime_ns INTEGER,
+                sha256 TEXT,
+                text TEXT,
+                PRIMARY KEY (path, settings)
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS extracted_sha256 ON extracted (sha256)")
+        self._db.commit()
+
+    def lookup(self, path, settings="", content=True):
+        """Returns the cached text of a file, or None if it must be parsed again.
+
+        With content=False, a missing entry or a size/mtime mismatch is a miss
+        right away, without reading the file.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        row = self._db.execute(
+            "SELECT size, mtime_ns, sha256, text FROM extracted WHERE path = ? AND settings = ?",
+            (path, settings),
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[3]
+        if not content:
+            return None
+
+        digest = file_sha256(path)
+        if row and row[2] == digest:
+            text = row[3]
+        else:
+            match = self._db.execute(
+                "SELECT text FROM extracted WHERE sha256 = ? AND settings = ? LIMIT 1", (digest, settings)
+            ).fetchone()
+            if match is None:
+                return None
+            text = match[0]
+        self._put(path, stat.st_size, stat.st_mtime_ns, digest, text, settings)
+        return text
+
+    def store(self, path, text, fingerprint=None, settings=""):
+        """Caches the text of a file.
+
+        `fingerprint` is the file_fingerprint() taken before parsing (e.g. in a
+        worker); if the file changed since, the next lookup sees another mtime
+        and hash and parses it again. Without it, the file is read and hashed now.
+        """
+        path = os.path.abspath(path)
+        self._put(path, *(fingerprint or file_fingerprint(path)), text, settings)
+
+    def _put(self, path, size, mtime_ns, digest, text, settings):
+        self._db.execute(
+            "INSERT OR REPLACE INTO extracted (path, size, mtime_ns, sha256, text, settings) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, digest, text, settings),
+        )
+        self._db.commit()
+
+    def evict_missing(self):
+        """Deletes the entries of files that no longer exist. Returns how many were removed."""
+        paths = [row[0] for row in self._db.execute("SELECT path FROM extracted")]
+        missing = [(path,) for path in paths if not os.path.exists(path)]
+        self._db.executemany("DELETE FROM extracted WHERE path = ?", missing)
+        self._db.commit()
+        return len(missing)
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM extracted").fetchone()[0]
+
+    def close(self):
+        self._db.close()
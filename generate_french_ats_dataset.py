@@ -4,12 +4,16 @@ Creates a synthetic French dataset for ATS / resume–job matching fine-tuning.
 
 Output: resume_job_pairs_fr.csv
 Columns: resume_id, resume_text, job_id, job_description, score
+With output_format="normalized": a resume_job_pairs_fr/ dataset directory
+(see pair_dataset.py) storing every text once.
 """
 
 import random
 import pandas as pd
 from faker import Faker
 
+from pair_dataset import save_dataset
+
 fake = Faker("fr_FR")
 random.seed(42)
 
@@ -136,12 +140,12 @@ def generate_job(job_id):
 # -----------------------------------------------------------
 # 4. Generate and pair data
 # -----------------------------------------------------------
-def generate_dataset(num_resumes=200, num_jobs=100):
+def generate_dataset(num_resumes=200, num_jobs=100, output_format="csv"):
     resumes = [generate_resume(i+1) for i in range(num_resumes)]
     jobs = [generate_job(j+1) for j in range(num_jobs)]
     print(f"Generated {len(resumes)} resumes and {len(jobs)} job descriptions.")
 
-    pairs = []
+    pairs = {"resume_id": [], "job_id": [], "score": []}
     for r in resumes:
         for j in jobs:
             # heuristic: higher score if same domain/title overlap
@@ -153,14 +157,24 @@ def generate_dataset(num_resumes=200, num_jobs=100):
                 score = random.uniform(0.5, 0.8)
             else:
                 score = random.uniform(0.0, 0.4)
-            pairs.append({
-                "resume_id": r["resume_id"],
-                "resume_text": r["resume_text"],
-                "job_id": j["job_id"],
-                "job_description": j["job_description"],
-                "score": round(score, 2)
-            })
-    df = pd.DataFrame(pairs)
+            pairs["resume_id"].append(r["resume_id"])
+            pairs["job_id"].append(j["job_id"])
+            pairs["score"].append(round(score, 2))
+
+    if output_format == "normalized":
+        save_dataset("data/exports/resume_job_pairs_fr", resumes, jobs, pairs)
+        print(f"✅ Dataset ready: {len(pairs['score'])} pairs saved to resume_job_pairs_fr/")
+        return
+
+    resume_texts = {r["resume_id"]: r["resume_text"] for r in resumes}
+    job_texts = {j["job_id"]: j["job_description"] for j in jobs}
+    df = pd.DataFrame({
+        "resume_id": pairs["resume_id"],
+        "resume_text": [resume_texts[i] for i in pairs["resume_id"]],
+        "job_id": pairs["job_id"],
+        "job_description": [job_texts[i] for i in pairs["job_id"]],
+        "score": pairs["score"],
+    })
     df.to_csv("data/exports/resume_job_pairs_fr.csv", index=False, encoding="utf-8-sig")
     print(f"✅ Dataset ready: {len(df)} pairs saved to resume_job_pairs_fr.csv")
 
@@ -168,4 +182,5 @@ def generate_dataset(num_resumes=200, num_jobs=100):
 # 5. Main
 # -----------------------------------------------------------
 if __name__ == "__main__":
-    generate_dataset(num_resumes=200, num_jobs=100)
+    import sys
+    generate_dataset(num_resumes=200, num_jobs=100, output_format=sys.argv[1] if len(sys.argv) > 1 else "csv")
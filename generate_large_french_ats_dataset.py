@@ -1,10 +1,13 @@
 # generate_large_french_ats_dataset.py
 
 import random
+import numpy as np
 import pandas as pd
 from faker import Faker
 import os
 
+from pair_dataset import save_dataset
+
 # NOTE: Ensure you have Faker installed: pip install Faker
 fake = Faker("fr_FR")
 random.seed(42)
@@ -50,15 +53,29 @@ EDU = [
 # -----------------------------------------------------------
 # 2. Resume generator
 # -----------------------------------------------------------
+EXPERIENCE_PATTERNS = [
+    "Responsable du développement de {thing} pour améliorer {impact}.",
+    "Mise en œuvre d'une solution {thing} utilisant {skill}.",
+    "Optimisation de {thing} entraînant une réduction de {percent} des coûts.",
+    "Coordination d'une équipe pour déployer {thing}."
+]
+THINGS = ["application web", "campagne marketing", "système de paie", "pipeline de données", "plan qualité"]
+IMPACTS = ["la performance", "l'efficacité", "la satisfaction client", "le rendement"]
+JOB_INTROS = [
+    "Nous recherchons un {title_lower} motivé pour rejoindre notre équipe.",
+    "Entreprise française recrute un {title_lower} expérimenté.",
+    "Offre d’emploi : {title} – rejoignez une société dynamique."
+]
+JOB_BONUSES = [
+    "Poste en CDI basé à Paris avec possibilité de télétravail.",
+    "Travail en équipe dans un environnement agile.",
+    "Opportunité d'évolution rapide au sein de l'entreprise."
+]
+
 def generate_experience(domain, skills):
-    patterns = [
-        "Responsable du développement de {thing} pour améliorer {impact}.",
-        "Mise en œuvre d'une solution {thing} utilisant {skill}.",
-        "Optimisation de {thing} entraînant une réduction de {percent} des coûts.",
-        "Coordination d'une équipe pour déployer {thing}."
-    ]
-    things = ["application web", "campagne marketing", "système de paie", "pipeline de données", "plan qualité"]
-    impacts = ["la performance", "l'efficacité", "la satisfaction client", "le rendement"]
+    patterns = EXPERIENCE_PATTERNS
+    things = THINGS
+    impacts = IMPACTS
     items = []
     all_skills = list(skills)
     for _ in range(random.randint(2, 4)):
@@ -118,19 +135,11 @@ def generate_job(job_id):
     num_skills = random.randint(3, min(6, len(all_skills)))
     sampled_skills = set(random.sample(all_skills, num_skills))
 
-    intro = random.choice([
-        f"Nous recherchons un {title.lower()} motivé pour rejoindre notre équipe.",
-        f"Entreprise française recrute un {title.lower()} expérimenté.",
-        f"Offre d’emploi : {title} – rejoignez une société dynamique."
-    ])
+    intro = random.choice(JOB_INTROS).format(title=title, title_lower=title.lower())
     
     desc = f"Compétences requises : {', '.join(sampled_skills)}. "
     exp = f"Expérience souhaitée : {random.randint(1,8)} ans. "
-    bonus = random.choice([
-        "Poste en CDI basé à Paris avec possibilité de télétravail.",
-        "Travail en équipe dans un environnement agile.",
-        "Opportunité d'évolution rapide au sein de l'entreprise."
-    ])
+    bonus = random.choice(JOB_BONUSES)
     job_text = f"{intro} {desc}{exp}{bonus}"
     return {
         "job_id": job_id,
@@ -149,7 +158,7 @@ def calculate_jaccard(set_a, set_b):
     union = set_a.union(set_b)
     return len(intersection) / len(union) if len(union) > 0 else 0.0
 
-def generate_dataset(num_resumes=500, num_jobs=200):
+def generate_dataset(num_resumes=500, num_jobs=200, output_format="csv"):
     # Target: 100,000 pairs (500 * 200)
     print(f"Generating {num_resumes} resumes and {num_jobs} job descriptions for ~{num_resumes * num_jobs} pairs...")
 
@@ -157,7 +166,7 @@ def generate_dataset(num_resumes=500, num_jobs=200):
     jobs = [generate_job(j+1) for j in range(num_jobs)]
     print(f"Generated {len(resumes)} resumes and {len(jobs)} job descriptions.")
 
-    pairs = []
+    pairs = {"resume_id": [], "job_id": [], "score": []}
     for r in resumes:
         for j in jobs:
             # 1. Calculate Skills Overlap (Jaccard)
@@ -184,24 +193,198 @@ def generate_dataset(num_resumes=500, num_jobs=200):
             # Final score clipping and rounding (0.00 to 1.00)
             score = round(max(0.0, min(1.0, score)), 2)
 
-            pairs.append({
-                "resume_id": r["resume_id"],
-                "resume_text": r["resume_text"],
-                "job_id": j["job_id"],
-                "job_description": j["job_description"],
-                "score": score
-            })
-    
+            pairs["resume_id"].append(r["resume_id"])
+            pairs["job_id"].append(j["job_id"])
+            pairs["score"].append(score)
+
+    if output_format == "normalized":
+        output_dir = "data/exports/a_resume_job_pairs_fr"
+        save_dataset(output_dir, resumes, jobs, pairs)
+        print(f"\n✅ Dataset ready: {len(pairs['score'])} pairs saved to {output_dir}/")
+        return
+
     # Ensure the directory exists
     output_path = "data/exports/a_resume_job_pairs_fr.csv"
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    df = pd.DataFrame(pairs)
+
+    resume_texts = {r["resume_id"]: r["resume_text"] for r in resumes}
+    job_texts = {j["job_id"]: j["job_description"] for j in jobs}
+    df = pd.DataFrame({
+        "resume_id": pairs["resume_id"],
+        "resume_text": [resume_texts[i] for i in pairs["resume_id"]],
+        "job_id": pairs["job_id"],
+        "job_description": [job_texts[i] for i in pairs["job_id"]],
+        "score": pairs["score"],
+    })
     df.to_csv(output_path, index=False, encoding="utf-8-sig")
     print(f"\n✅ Dataset ready: {len(df)} pairs saved to {output_path}")
 
+# -----------------------------------------------------------
+# 4b. Vectorized generation (bulk NumPy draws, matrix Jaccard)
+# -----------------------------------------------------------
+DOMAIN_NAMES = list(DOMAINS)
+SKILL_VOCAB = [skill for d in DOMAIN_NAMES for skill in DOMAINS[d]["skills"]]
+TITLE_VOCAB = [title for d in DOMAIN_NAMES for title in DOMAINS[d]["titles"]]
+# DOMAIN_SKILLS[d, s]: skill s belongs to domain d
+DOMAIN_SKILLS = np.array([[skill in DOMAINS[d]["skills"] for skill in SKILL_VOCAB] for d in DOMAIN_NAMES])
+TITLE_COUNTS = np.array([len(DOMAINS[d]["titles"]) for d in DOMAIN_NAMES])
+TITLE_OFFSETS = np.cumsum(TITLE_COUNTS) - TITLE_COUNTS
+# SAME_TITLE[a, b]: same heuristic as generate_dataset, resume title a vs job title b
+SAME_TITLE = np.array([[a.split()[0].lower() in b.lower() for b in TITLE_VOCAB] for a in TITLE_VOCAB])
+
+def sample_profiles(rng, n, min_skills, max_skills):
+    """Draws domain, title and a skill subset for n profiles at once.
+
+    Returns domain ids, title ids and an (n, len(SKILL_VOCAB)) boolean skill matrix.
+    Skill counts are drawn uniformly in [min_skills(d), max_skills(d)] per domain d.
+    """
+    domains = rng.integers(0, len(DOMAIN_NAMES), n)
+    titles = TITLE_OFFSETS[domains] + (rng.random(n) * TITLE_COUNTS[domains]).astype(np.int64)
+
+    lo, hi = min_skills[domains], max_skills[domains]
+    counts = lo + (rng.random(n) * (hi - lo + 1)).astype(np.int64)
+
+    # Random keys, with skills outside the domain pushed last: the k smallest
+    # keys of a row are a uniform sample of k domain skills.
+    keys = rng.random((n, len(SKILL_VOCAB)))
+    keys[~DOMAIN_SKILLS[domains]] = 2.0
+    ranks = np.argsort(np.argsort(keys, axis=1), axis=1)
+    return domains, titles, ranks < counts[:, None]
+
+def score_pairs(rng, r_domains, r_titles, r_skills, j_domains, j_titles, j_skills):
+    """Scores of every (resume, job) pair with the generate_dataset rules, as one matrix op."""
+    inter = r_skills.astype(np.float32) @ j_skills.T.astype(np.float32)
+    union = r_skills.sum(1)[:, None] + j_skills.sum(1)[None, :] - inter
+    jaccard = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+    same_domain = r_domains[:, None] == j_domains[None, :]
+    strong = same_domain & SAME_TITLE[r_titles[:, None], j_titles[None, :]]
+    partial = same_domain & ~strong
+
+    u = rng.random(inter.shape, dtype=np.float32)
+    base = np.where(strong, 0.8 + 0.2 * u, np.where(partial, 0.5 + 0.3 * u, 0.4 * u))
+    score = np.where(
+        strong, base * 0.5 + jaccard * 0.5,
+        np.where(partial, base * 0.3 + jaccard * 0.7, base * 0.8 + jaccard * 0.2),
+    )
+    return np.round(np.clip(score, 0.0, 1.0), 2).astype(np.float32)
+
+def _skills_text(row):
+    return ", ".join(SKILL_VOCAB[s] for s in np.flatnonzero(row))
+
+def build_resume_texts(rng, fake, domains, titles, skills):
+    n = len(domains)
+    n_items = rng.integers(2, 5, n)
+    patterns = rng.integers(0, len(EXPERIENCE_PATTERNS), (n, 4))
+    things = rng.integers(0, len(THINGS), (n, 4))
+    impacts = rng.integers(0, len(IMPACTS), (n, 4))
+    percents = rng.integers(5, 41, (n, 4))
+    skill_picks = rng.random((n, 4))
+    years = rng.integers(1, 16, n)
+    edus = rng.integers(0, len(EDU), n)
+
+    texts = []
+    for i in range(n):
+        own_skills = np.flatnonzero(skills[i])
+        items = []
+        for k in range(n_items[i]):
+            items.append("- " + EXPERIENCE_PATTERNS[patterns[i, k]].format(
+                thing=THINGS[things[i, k]],
+                impact=IMPACTS[impacts[i, k]],
+                skill=SKILL_VOCAB[own_skills[int(skill_picks[i, k] * len(own_skills))]],
+                percent=f"{percents[i, k]}%"
+            ))
+        name = fake.name()
+        domain = DOMAIN_NAMES[domains[i]]
+        texts.append(f"""Prénom/Nom: {name}
+Ville: {fake.city()}
+Titre: {TITLE_VOCAB[titles[i]]}
+Profil: {name} possède {years[i]} ans d'expérience dans le domaine {domain.lower()}.
+Compétences: {_skills_text(skills[i])}
+Expérience:
+{chr(10).join(items)}
+Formation:
+{EDU[edus[i]]}""")
+    return texts
+
+def build_job_texts(rng, titles, skills):
+    n = len(titles)
+    intros = rng.integers(0, len(JOB_INTROS), n)
+    years = rng.integers(1, 9, n)
+    bonuses = rng.integers(0, len(JOB_BONUSES), n)
+    texts = []
+    for i in range(n):
+        title = TITLE_VOCAB[titles[i]]
+        intro = JOB_INTROS[intros[i]].format(title=title, title_lower=title.lower())
+        texts.append(
+            f"{intro} Compétences requises : {_skills_text(skills[i])}. "
+            f"Expérience souhaitée : {years[i]} ans. {JOB_BONUSES[bonuses[i]]}"
+        )
+    return texts
+
+def generate_dataset_vectorized(num_resumes=500, num_jobs=200, seed=42,
+                                output_path="data/exports/a_resume_job_pairs_fr.csv", output_format="csv"):
+    """Vectorized generate_dataset: same rules, every random component drawn in bulk.
+
+    Returns (resumes_df, jobs_df, pairs) where pairs holds int32 resume_id /
+    job_id columns and a float32 score column. If output_path is set, the
+    denormalized pair CSV of generate_dataset is also written (the slow part
+    for large datasets, since every text is repeated in every pair), or with
+    output_format="normalized" a pair_dataset directory next to it.
+    """
+    rng = np.random.default_rng(seed)
+    fake_local = Faker("fr_FR")
+    fake_local.seed_instance(seed)
+
+    skill_counts = DOMAIN_SKILLS.sum(1)
+    r_domains, r_titles, r_skills = sample_profiles(
+        rng, num_resumes, np.minimum(4, skill_counts), np.minimum(skill_counts, 8))
+    j_domains, j_titles, j_skills = sample_profiles(
+        rng, num_jobs, np.full_like(skill_counts, 3), np.minimum(6, skill_counts))
+    scores = score_pairs(rng, r_domains, r_titles, r_skills, j_domains, j_titles, j_skills)
+
+    resumes_df = pd.DataFrame({
+        "resume_id": np.arange(1, num_resumes + 1, dtype=np.int32),
+        "domain": [DOMAIN_NAMES[d] for d in r_domains],
+        "job_title": [TITLE_VOCAB[t] for t in r_titles],
+        "resume_text": build_resume_texts(rng, fake_local, r_domains, r_titles, r_skills),
+    })
+    jobs_df = pd.DataFrame({
+        "job_id": np.arange(1, num_jobs + 1, dtype=np.int32),
+        "domain": [DOMAIN_NAMES[d] for d in j_domains],
+        "job_title": [TITLE_VOCAB[t] for t in j_titles],
+        "job_description": build_job_texts(rng, j_titles, j_skills),
+    })
+    pairs = {
+        "resume_id": np.repeat(resumes_df["resume_id"].to_numpy(), num_jobs),
+        "job_id": np.tile(jobs_df["job_id"].to_numpy(), num_resumes),
+        "score": scores.ravel(),
+    }
+    print(f"Generated {num_resumes} resumes, {num_jobs} job descriptions and {scores.size} pairs.")
+
+    if output_path and output_format == "normalized":
+        output_dir = os.path.splitext(output_path)[0]
+        save_dataset(output_dir, resumes_df, jobs_df, pairs)
+        print(f"\n✅ Dataset ready: {scores.size} pairs saved to {output_dir}/")
+    elif output_path:
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        df = pd.DataFrame({
+            "resume_id": pairs["resume_id"],
+            "resume_text": resumes_df["resume_text"].to_numpy()[pairs["resume_id"] - 1],
+            "job_id": pairs["job_id"],
+            "job_description": jobs_df["job_description"].to_numpy()[pairs["job_id"] - 1],
+            "score": pairs["score"],
+        })
+        df.to_csv(output_path, index=False, encoding="utf-8-sig", float_format="%.2f")
+        print(f"\n✅ Dataset ready: {len(df)} pairs saved to {output_path}")
+
+    return resumes_df, jobs_df, pairs
+
 # -----------------------------------------------------------
 # 5. Main
 # -----------------------------------------------------------
 if __name__ == "__main__":
-    generate_dataset(num_resumes=500, num_jobs=200)
\ No newline at end of file
+    import sys
+    output_format = sys.argv[1] if len(sys.argv) > 1 else "csv"  # "csv" or "normalized"
+    generate_dataset_vectorized(num_resumes=500, num_jobs=200, output_format=output_format)
\ No newline at end of file
@@ -1,6 +1,9 @@
 # generate_synthetic_cv_fr.py
 import random
 import csv
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
 import pandas as pd
 
@@ -40,29 +43,30 @@ IMPACTS = [
     "le taux de conversion"
 ]
 
-def sample_skills(n=6):
-    return ", ".join(random.sample(SKILLS, min(n, len(SKILLS))))
+# `rng` is the global random module by default, or a random.Random of a shard.
+def sample_skills(n=6, rng=random):
+    return ", ".join(rng.sample(SKILLS, min(n, len(SKILLS))))
 
-def generate_experience(num_items=3):
+def generate_experience(num_items=3, rng=random):
     items = []
     for _ in range(num_items):
-        pattern = random.choice(BULLET_PATTERNS)
-        thing = random.choice(THINGS)
-        impact = random.choice(IMPACTS)
-        skill = random.choice(SKILLS)
-        percent = f"{random.randint(5,45)}%"
+        pattern = rng.choice(BULLET_PATTERNS)
+        thing = rng.choice(THINGS)
+        impact = rng.choice(IMPACTS)
+        skill = rng.choice(SKILLS)
+        percent = f"{rng.randint(5,45)}%"
         text = pattern.format(thing=thing, impact=impact, skill=skill, percent=percent)
         items.append("- " + text)
     return "\n".join(items)
 
-def generate_cv():
-    name = fake.name()
-    city = fake.city()
-    title = random.choice(JOB_TITLES)
-    skills = sample_skills(random.randint(4,8))
-    education = random.choice(EDU)
-    exp = generate_experience(random.randint(2,4))
-    years = random.randint(1,15)
+def generate_cv(rng=random, faker=fake):
+    name = faker.name()
+    city = faker.city()
+    title = rng.choice(JOB_TITLES)
+    skills = sample_skills(rng.randint(4,8), rng)
+    education = rng.choice(EDU)
+    exp = generate_experience(rng.randint(2,4), rng)
+    years = rng.randint(1,15)
 
     # A simple textual CV (one-field). You may create structured fields if you prefer.
     cv_text = f"""
@@ -92,5 +96,51 @@ def generate_n_csv(n=2000, out_path="synthetic_cv_fr.csv"):
 
     print(f"Wrote {len(df)} rows to {out_path}")
 
+# === Sharded generation (process pool, one CSV per shard) ===
+FIELDNAMES = ["resume_text", "job_title", "skills", "years_experience"]
+
+def shard_seed(seed, shard):
+    """Seed of one shard, derived from the global seed and the shard index only."""
+    digest = hashlib.sha256(f"{seed}:{shard}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def shard_sizes(n, num_shards):
+    return [n // num_shards + (1 if i < n % num_shards else 0) for i in range(num_shards)]
+
+def generate_shard(shard, size, seed, out_path):
+    """Generates one shard with its own random.Random and Faker, streaming rows to out_path."""
+    rng = random.Random(shard_seed(seed, shard))
+    faker = Faker("fr_FR")
+    faker.seed_instance(shard_seed(seed, shard))
+    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for _ in range(size):
+            writer.writerow(generate_cv(rng, faker))
+    return out_path
+
+def generate_sharded(n=1_000_000, out_dir="data/exports/synthetic_cv_fr", num_shards=16, seed=42, max_workers=None):
+    """Generates n CVs in num_shards CSV files (synthetic_cv_fr-00000.csv, ...) across a process pool.
+
+    The content of every shard depends only on (seed, num_shards), not on
+    max_workers or scheduling, so runs are reproducible.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f"synthetic_cv_fr-{shard:05d}.csv") for shard in range(num_shards)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(generate_shard, shard, size, seed, path)
+            for shard, (size, path) in enumerate(zip(shard_sizes(n, num_shards), paths))
+        ]
+        for future in futures:
+            future.result()
+    print(f"Wrote {n} rows to {num_shards} shards in {out_dir}")
+    return paths
+
 if __name__ == "__main__":
-    generate_n_csv(2000, "data/exports/synthetic_cv_fr.csv")
+    import sys
+    if len(sys.argv) > 1:
+        # python generate_synthetic_cv_fr.py N [NUM_SHARDS]
+        generate_sharded(int(sys.argv[1]), num_shards=int(sys.argv[2]) if len(sys.argv) > 2 else 16)
+    else:
+        generate_n_csv(2000, "data/exports/synthetic_cv_fr.csv")
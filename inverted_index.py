@@ -0,0 +1,143 @@
+"""
+inverted_index.py
+Inverted index from normalized skill and keyword terms to resume ids, used to
+narrow the candidate set before the embedding scorer runs.
+
+Resumes are indexed under two kinds of terms:
+    skill terms   canonical skills found by the SkillExtractor ("skill:Python")
+                  in the Compétences section (the whole text if there is none)
+    word terms    accent-stripped, lowercased words (stop words removed)
+A job's keywords (from extract_keywords, or its "Compétences requises") map
+to skill terms when they name a known skill, to word terms otherwise.
+candidates() keeps the resumes matching at least `min_overlap` query terms,
+or scoring at least `bm25_threshold` with BM25. The index is incremental:
+add() new CVs as they arrive, also while other threads query it (queries
+work on copies of the postings they read).
+"""
+
+import math
+import re
+import threading
+from array import array
+
+import numpy as np
+
+from resume_record import parse_sections
+from skill_extractor_fallback import default_extractor, normalize_text
+
+_WORD = re.compile(r"\w+")
+_REQUIRED_SKILLS = re.compile(r"comp[ée]tences requises\s*:\s*([^.\n]*)", re.IGNORECASE)
+STOP_WORDS = frozenset(
+    "a au aux avec ce ces dans de des du en et la le les leur mais ou par pour sur un une "
+    "the and of for with in".split()
+)
+
+
+def word_terms(text):
+    return [w for w in _WORD.findall(normalize_text(text)) if len(w) > 1 and w not in STOP_WORDS]
+
+
+def required_skills(job_description):
+    """Skills listed after "Compétences requises :" in a job description, [] if there is none."""
+    match = _REQUIRED_SKILLS.search(job_description)
+    if not match:
+        return []
+    return [skill.strip() for skill in match.group(1).split(",") if skill.strip()]
+
+
+class InvertedIndex:
+    def __init__(self, extractor=None):
+        self.extractor = extractor or default_extractor()
+        self._postings = {}     # term -> (array of doc ids, array of term frequencies)
+        self.doc_lengths = array("I")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def document_terms(self, text):
+        """Term frequencies of a resume text."""
+        counts = {}
+        for term in word_terms(text):
+            counts[term] = counts.get(term, 0) + 1
+        skills_text = parse_sections(text).get("Compétences") or text
+        for skill_id in self.extractor.extract_ids(skills_text):
+            counts[f"skill:{self.extractor.skills[skill_id]}"] = 1
+        return counts
+
+    def query_terms(self, keywords):
+        """Distinct query terms of a keyword list."""
+        terms = {}
+        for keyword in keywords:
+            skill_ids = self.extractor.extract_ids(keyword)
+            if skill_ids:
+                for skill_id in skill_ids:
+                    terms[f"skill:{self.extractor.skills[skill_id]}"] = None
+            else:
+                for term in word_terms(keyword):
+                    terms[term] = None
+        return list(terms)
+
+    def add(self, text):
+        """Indexes one resume; its id is the number of resumes indexed before it."""
+        counts = self.document_terms(text)
+        with self._lock:
+            doc_id = len(self.doc_lengths)
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(doc_id)
+                postings[1].append(min(tf, 65535))
+            self.doc_lengths.append(sum(counts.values()))
+        return doc_id
+
+    def add_many(self, texts):
+        return [self.add(text) for text in texts]
+
+    def _snapshot(self, terms):
+        """(document lengths, [(ids, tfs) per indexed term]) copied under the lock.
+
+        Copies, not np.frombuffer views: a live view would make a concurrent
+        add() fail to grow the array (BufferError).
+        """
+        with self._lock:
+            lengths = np.array(self.doc_lengths, dtype=np.uint32)
+            postings = [
+                (np.array(ids, dtype=np.uint32), np.array(tfs, dtype=np.uint16))
+                for ids, tfs in (self._postings[term] for term in terms if term in self._postings)
+            ]
+        return lengths, postings
+
+    def overlap(self, keywords):
+        """Number of query terms present in every resume (an array over all ids)."""
+        lengths, postings = self._snapshot(self.query_terms(keywords))
+        counts = np.zeros(len(lengths), dtype=np.int32)
+        for ids, _ in postings:
+            counts[ids] += 1
+        return counts
+
+    def bm25(self, keywords, k1=1.2, b=0.75):
+        """BM25 score of every resume against the keywords (an array over all ids)."""
+        lengths, postings = self._snapshot(self.query_terms(keywords))
+        n = len(lengths)
+        scores = np.zeros(n, dtype=np.float32)
+        if n == 0:
+            return scores
+        lengths = lengths.astype(np.float32)
+        norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1e-9))
+        for ids, tf in postings:
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            tf = tf.astype(np.float32)
+            scores[ids] += idf * tf * (k1 + 1) / (tf + norm[ids])
+        return scores
+
+    def candidates(self, keywords, min_overlap=1, bm25_threshold=None):
+        """Sorted ids of the resumes passing the filter.
+
+        With bm25_threshold set, resumes scoring at least that much are kept;
+        otherwise resumes matching at least min_overlap query terms.
+        """
+        if bm25_threshold is not None:
+            return np.flatnonzero(self.bm25(keywords) >= bm25_threshold)
+        return np.flatnonzero(self.overlap(keywords) >= min_overlap)
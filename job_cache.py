@@ -0,0 +1,234 @@
+"""
+job_cache.py
+In-process LRU cache of job keyword lists and job embeddings, optionally
+backed by disk.
+
+Entries are keyed by the normalized job text (case-folded, whitespace
+collapsed) and the version of what produced them: the Ollama model name for
+keywords, the registry model_id() for embeddings. The cache is bounded by a
+number of entries and a number of bytes; least recently used entries are
+evicted first, and entries older than `ttl` seconds are dropped. Hits,
+misses, evictions and expirations are counted (see stats()). Cached
+embeddings are read-only and keyword lists are returned as copies, so no
+caller can change what the others get. The SQLite
+keyword cache of ollama_service uses the same TTL, so an expired keyword list
+is asked to the LLM again rather than reloaded from disk.
+
+With `disk_path` (or ATS_JOB_CACHE_PATH), entries also go to a SQLite file,
+so a repeated job skips both the LLM and the encoder across restarts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from model_registry import model_id_of
+
+MAX_ENTRIES = int(os.environ.get("ATS_JOB_CACHE_SIZE", "1024"))
+MAX_BYTES = 64 * 2 ** 20
+TTL = float(os.environ.get("ATS_JOB_CACHE_TTL", "86400"))
+DISK_PATH = os.environ.get("ATS_JOB_CACHE_PATH")
+
+
+def normalize_job_text(text):
+    return " ".join(text.casefold().split())
+
+
+def job_key(kind, version, text):
+    normalized = normalize_job_text(text)
+    return hashlib.sha256(f"{kind}\0{version}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def _dumps(value):
+    if isinstance(value, np.ndarray):
+        return "embedding", np.asarray(value, dtype=np.float32).tobytes()
+    return "keywords", json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _freeze(value):
+    """Value as held by the cache: shared by every caller, so it must not change."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, list):
+        value = tuple(value)
+    return value
+
+
+def _thaw(value):
+    """Value as returned to a caller: keyword lists are copies it may edit."""
+    return list(value) if isinstance(value, tuple) else value
+
+
+def _loads(kind, blob):
+    if kind == "embedding":
+        return np.frombuffer(blob, dtype=np.float32).copy()
+    return json.loads(blob.decode("utf-8"))
+
+
+class LRUCache:
+    """Thread-safe key -> value LRU with entry, byte and TTL limits, and an optional SQLite layer."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl=TTL, disk_path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (value, created, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = self.evictions = self.expirations = 0
+        self._db = None
+        if disk_path:
+            if os.path.dirname(disk_path):
+                os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS job_cache (key TEXT PRIMARY KEY, kind TEXT, value BLOB, created REAL)"
+            )
+            self._db.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def _insert(self, key, value, created):
+        value = _freeze(value)
+        size = _nbytes(value)
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (value, created, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _thaw(entry[0])
+                self._bytes -= self._entries.pop(key)[2]
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT kind, value, created FROM job_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[2], now):
+                        value = _loads(row[0], row[1])
+                        self._insert(key, value, row[2])
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return _thaw(value)
+                    self._db.execute("DELETE FROM job_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.expirations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._insert(key, value, now)
+            if self._db is not None:
+                kind, blob = _dumps(value)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO job_cache (key, kind, value, created) VALUES (?, ?, ?, ?)",
+                    (key, kind, blob, now),
+                )
+                self._db.commit()
+
+    def get_or_compute(self, key, compute):
+        """Cached value of `key`, else compute() (stored unless it raises)."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM job_cache")
+                self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_job_cache():
+    """Shared job cache, created on first use (on disk if ATS_JOB_CACHE_PATH is set)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = LRUCache(disk_path=DISK_PATH)
+    return _default_cache
+
+
+def cached_keywords(job_description, model_name, compute, cache=None):
+    """Keyword list of a job for the LLM `model_name`; compute() runs on a miss only."""
+    cache = get_job_cache() if cache is None else cache
+    return cache.get_or_compute(job_key("keywords", model_name, job_description), compute)
+
+
+def embedding_key(model, job_description):
+    """Cache key of a job embedding, or None for a model that did not come from
+    model_registry (no stable version to key the cache with)."""
+    version = model_id_of(model)
+    return None if version is None else job_key("embedding", version, job_description)
+
+
+def encode_job(model, job_description, cache=None):
+    """Normalized embedding of a job description, encoded once per model version."""
+    key = embedding_key(model, job_description)
+    if key is None:
+        return model.encode(job_description, normalize_embeddings=True, convert_to_numpy=True)
+    cache = get_job_cache() if cache is None else cache
+    return cache.get_or_compute(
+        key,
+        lambda: np.asarray(
+            model.encode(job_description, normalize_embeddings=True, convert_to_numpy=True), dtype=np.float32
+        ),
+    )
@@ -0,0 +1,112 @@
+"""
+model_registry.py
+Lazily loaded, shared embedding models.
+
+Models are created on first use and shared by every module of the process,
+one instance per (model name, device, backend). Importing this module does not load
+torch or sentence-transformers. Worker pools that fork should call
+`preload()` in the parent first, so children share the already-loaded weights
+instead of each loading their own copy.
+
+The default model can be switched to a fine-tuned directory, e.g.
+`ATS_MODEL_NAME=models/ats_fr_similarity` or `set_default_model(FINETUNED_MODEL_DIR)`.
+
+`backend="onnx"` (or `ATS_MODEL_BACKEND=onnx`) serves the same model through
+ONNX Runtime with int8 weights (see onnx_backend.py); the export is made once
+under ONNX_DIR and reused.
+"""
+
+import os
+import threading
+
+BASE_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+FINETUNED_MODEL_DIR = "models/ats_fr_similarity"
+ONNX_DIR = "models/onnx"
+
+_default_model_name = os.environ.get("ATS_MODEL_NAME", BASE_MODEL_NAME)
+_default_backend = os.environ.get("ATS_MODEL_BACKEND", "torch")
+_models = {}
+_lock = threading.Lock()
+
+
+def default_model_name():
+    return _default_model_name
+
+
+def set_default_model(name):
+    """Makes `name` (hub id or local directory) the model returned by get_model()."""
+    global _default_model_name
+    _default_model_name = name
+
+
+def model_id(name=None, backend=None):
+    """Identifies the vectors a model produces, e.g. to key an EmbeddingStore."""
+    name = name or _default_model_name
+    backend = backend or _default_backend
+    return name if backend == "torch" else f"{name}#{backend}-int8"
+
+
+def onnx_dir(name):
+    """Directory holding the ONNX export of a model."""
+    from onnx_backend import is_exported
+
+    if is_exported(name):
+        return name
+    return os.path.join(ONNX_DIR, name.strip("/").replace("/", "__"))
+
+
+def _load(name, device, backend):
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(name, device=device)
+    if backend == "onnx":
+        from onnx_backend import OnnxEncoder, export_onnx, is_exported
+
+        directory = onnx_dir(name)
+        if not is_exported(directory):
+            export_onnx(name, directory)
+        return OnnxEncoder(directory)
+    raise ValueError(f"Unknown model backend: {backend}")
+
+
+def get_model(name=None, device=None, backend=None):
+    """Returns the shared model for `name`, loading it on first use.
+
+    The torch backend returns a SentenceTransformer; the onnx backend returns
+    an OnnxEncoder with a compatible encode().
+    """
+    key = (name or _default_model_name, device, backend or _default_backend)
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                model = _load(*key)
+                _models[key] = model
+    return model
+
+
+def preload(name=None, device=None, make_default=False, backend=None):
+    """Loads a model now (e.g. before forking workers) and optionally makes it the default."""
+    model = get_model(name, device, backend)
+    if make_default and name:
+        set_default_model(name)
+    return model
+
+
+def loaded_models():
+    return list(_models)
+
+
+def unload(name=None, device=None, backend=None):
+    with _lock:
+        _models.pop((name or _default_model_name, device, backend or _default_backend), None)
+
+
+def model_id_of(model):
+    """model_id() of a model returned by get_model(), or None for a model loaded elsewhere."""
+    for (name, _, backend), loaded in list(_models.items()):
+        if loaded is model:
+            return model_id(name, backend)
+    return None
@@ -1,24 +1,212 @@
-import subprocess
+"""
+ollama_service.py
+Keyword extraction with LLaMA3 through the Ollama REST API.
 
-def extract_keywords(job_description):
-    prompt = f"""
-    Voici une description de poste : 
+OllamaClient keeps one keep-alive HTTP connection to the Ollama server
+(and asks it to keep the model loaded), so a call costs one request instead
+of a process spawn plus model warm-up. Answers are cached on disk, keyed by
+a hash of the model name and the full prompt, and expire after the same TTL
+as the in-process job cache (ATS_JOB_CACHE_TTL). extract_keywords_many runs
+many extractions concurrently from asyncio, with a cap on in-flight requests.
+When Ollama times out, fails or answers nothing, the deterministic lexicon
+extractor from skill_extractor_fallback is used instead. Successful answers
+also go through the in-process job cache (job_cache.py), keyed by the
+normalized job text, so a repeated job does not even reach SQLite or Ollama.
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+from job_cache import TTL, cached_keywords
+from skill_extractor_fallback import extract_skills
+
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_MODEL = "llama3"
+OLLAMA_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "30"))
+CACHE_PATH = "data/cache/keywords.sqlite"
+
+PROMPT_TEMPLATE = """
+    Voici une description de poste :
     {job_description}
 
     Donne-moi uniquement une liste mots-clés importants, séparés par des virgules.
     Ne mets rien d'autre dans la réponse.
     """
 
-    # Run Ollama (this will stream plain text, not JSON)
-    result = subprocess.run(
-        ["ollama", "run", "llama3"],
-        input=prompt.encode("utf-8"),
-        capture_output=True
-    )
 
-    # Decode the model's output
-    output = result.stdout.decode("utf-8").strip()
+def build_prompt(job_description):
+    return PROMPT_TEMPLATE.format(job_description=job_description)
+
+
+def parse_keywords(output):
+    """Splits the model's comma-separated answer into keywords."""
+    return [kw.strip() for kw in output.strip().split(",") if kw.strip()]
+
+
+def cache_key(model, prompt):
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class KeywordCache:
+    """Persistent prompt-hash -> keyword list cache (SQLite), safe to share between threads.
+
+    Entries older than `ttl` seconds (None: never) are deleted when read.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=TTL):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS keywords (key TEXT PRIMARY KEY, keywords TEXT, created REAL)")
+        self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT keywords, created FROM keywords WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and time.time() - row[1] > self.ttl:
+                self._db.execute("DELETE FROM keywords WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+        return json.loads(row[0])
+
+    def set(self, key, keywords):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO keywords (key, keywords, created) VALUES (?, ?, ?)",
+                (key, json.dumps(keywords, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class OllamaClient:
+    def __init__(self, base_url=OLLAMA_URL, model=OLLAMA_MODEL, timeout=OLLAMA_TIMEOUT, cache=None, keep_alive="10m"):
+        url = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+        self.host = url.hostname
+        self.port = url.port or 11434
+        self.model = model
+        self.timeout = timeout
+        self.cache = cache
+        self.keep_alive = keep_alive
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def generate(self, prompt):
+        """Sends one non-streaming /api/generate request and returns the answer text."""
+        body = json.dumps(
+            {"model": self.model, "prompt": prompt, "stream": False, "keep_alive": self.keep_alive}
+        )
+        headers = {"Content-Type": "application/json"}
+        with self._lock:
+            # One retry: the server may have closed the idle keep-alive connection.
+            for attempt in range(2):
+                conn = self._connection()
+                try:
+                    conn.request("POST", "/api/generate", body=body.encode("utf-8"), headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    self._close()
+                    if attempt == 1:
+                        raise
+                except OSError:
+                    self._close()
+                    raise
+
+        if response.status != 200:
+            raise RuntimeError(f"Ollama returned HTTP {response.status}: {data[:200]!r}")
+        return json.loads(data)["response"]
+
+    def extract_keywords(self, job_description):
+        prompt = build_prompt(job_description)
+        key = cache_key(self.model, prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        keywords = parse_keywords(self.generate(prompt))
+        if self.cache is not None:
+            self.cache.set(key, keywords)
+        return keywords
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+_default_client = None
+
+
+def get_client():
+    """Shared client with the on-disk cache, created on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = OllamaClient(cache=KeywordCache())
+    return _default_client
+
+
+def extract_keywords_or_fallback(client, job_description):
+    """Asks Ollama for keywords, falling back to the lexicon extractor on failure."""
+    try:
+        keywords = cached_keywords(job_description, client.model, lambda: client.extract_keywords(job_description))
+    except (OSError, RuntimeError, ValueError, KeyError) as e:
+        print(f"⚠️ Ollama unavailable ({type(e).__name__}: {e}), using skill lexicon fallback.")
+        return extract_skills(job_description)
+    return keywords or extract_skills(job_description)
+
+
+def extract_keywords(job_description):
+    return extract_keywords_or_fallback(get_client(), job_description)
+
+
+async def extract_keywords_many(job_descriptions, max_concurrency=4, base_url=OLLAMA_URL,
+                                model=OLLAMA_MODEL, cache=None):
+    """Extracts keywords for many job descriptions concurrently.
+
+    At most `max_concurrency` requests are in flight, each on its own
+    keep-alive connection. Returns the keyword lists in input order.
+    """
+    if cache is None:
+        cache = get_client().cache
+    pool = asyncio.Queue()
+    clients = [OllamaClient(base_url, model, cache=cache) for _ in range(max_concurrency)]
+    for client in clients:
+        pool.put_nowait(client)
+
+    async def extract_one(job_description):
+        client = await pool.get()
+        try:
+            return await asyncio.to_thread(extract_keywords_or_fallback, client, job_description)
+        finally:
+            pool.put_nowait(client)
 
-    # Split into keywords
-    keywords = [kw.strip() for kw in output.split(",") if kw.strip()]
-    return keywords
+    try:
+        return await asyncio.gather(*(extract_one(job) for job in job_descriptions))
+    finally:
+        for client in clients:
+            client.close()
@@ -0,0 +1,155 @@
+"""
+onnx_backend.py
+ONNX Runtime inference backend for the sentence embedding model, for CPU-only
+scoring nodes.
+
+export_onnx() exports the transformer of a SentenceTransformer (hub id or
+fine-tuned directory) to ONNX and applies dynamic int8 quantization.
+OnnxEncoder loads the result and offers the subset of
+SentenceTransformer.encode() used by the scoring code, with the same pooling,
+so it can be passed wherever a model is expected. model_registry.get_model(
+backend="onnx") exports on first use and shares the encoder.
+"""
+
+import json
+import os
+
+import numpy as np
+
+CONFIG_FILE = "onnx_config.json"
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+POOLING_MODES = ("mean", "cls", "max")
+
+
+def _check_pooling(mode):
+    if mode not in POOLING_MODES:
+        raise ValueError(f"Unsupported pooling mode {mode!r} (supported: {', '.join(POOLING_MODES)}).")
+    return mode
+
+
+def _pooling_mode(pooling):
+    if pooling is None:
+        return "mean"
+    if hasattr(pooling, "get_pooling_mode_str"):
+        return _check_pooling(pooling.get_pooling_mode_str())
+    return _check_pooling(pooling.pooling_mode)
+
+
+def export_onnx(model_name_or_path, output_dir, quantize=True, opset=17):
+    """Exports a SentenceTransformer to `output_dir` (fp32 and, optionally, int8 ONNX)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    st_model = SentenceTransformer(model_name_or_path, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    pooling = next((m for m in st_model if type(m).__name__ == "Pooling"), None)
+    dummy = tokenizer(["Développeur Python avec expérience en Django."], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(transformer),
+            tuple(dummy[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, os.path.join(output_dir, INT8_FILE), weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    config = {
+        "source_model": model_name_or_path,
+        "input_names": input_names,
+        "pooling": _pooling_mode(pooling),
+        "normalize": any(type(m).__name__ == "Normalize" for m in st_model),
+        "max_seq_length": st_model.max_seq_length,
+        "dim": st_model.get_sentence_embedding_dimension(),
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return output_dir
+
+
+def is_exported(directory):
+    return os.path.exists(os.path.join(directory, CONFIG_FILE))
+
+
+class OnnxEncoder:
+    def __init__(self, model_dir, quantized=True, num_threads=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, CONFIG_FILE), "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_seq_length = self.config["max_seq_length"]
+        self.input_names = self.config["input_names"]
+        _check_pooling(self.config["pooling"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        path = os.path.join(model_dir, INT8_FILE if quantized else FP32_FILE)
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def get_sentence_embedding_dimension(self):
+        return self.config["dim"]
+
+    def _pool(self, hidden, mask):
+        mode = self.config["pooling"]
+        if mode == "cls":
+            return hidden[:, 0]
+        if mode == "max":
+            return np.where(mask > 0, hidden, -1e9).max(axis=1)
+        if mode == "mean":
+            return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        raise ValueError(f"Unsupported pooling mode {mode!r}.")
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True,
+               show_progress_bar=False, **kwargs):
+        """Encodes a text or a list of texts into a float32 NumPy array."""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Longest first, so each batch holds texts of similar length.
+        order = np.argsort([-len(s) for s in sentences], kind="stable")
+        embeddings = np.empty((len(sentences), self.config["dim"]), dtype=np.float32)
+        for start in range(0, len(sentences), batch_size):
+            idx = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [sentences[i] for i in idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            embeddings[idx] = self._pool(hidden, mask)
+
+        if normalize_embeddings or self.config["normalize"]:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
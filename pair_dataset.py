@@ -0,0 +1,163 @@
+"""
+pair_dataset.py
+Normalized resume/job pair dataset: each text is stored once.
+
+The pair CSVs repeat the full resume text in every one of its pairs (and the
+job text in every one of its pairs). A normalized dataset is a directory:
+    resumes.parquet   resume_id, domain, job_title, resume_text
+    jobs.parquet      job_id, domain, job_title, job_description
+    resume_id.npy     int32, one entry per pair
+    job_id.npy        int32, one entry per pair
+    score.npy         float16, one entry per pair
+
+PairDataset loads the tables on first use, memory-maps the pair columns and
+expands pairs to texts lazily, chunk by chunk. convert_pairs_csv() turns an
+existing pair CSV into this format.
+
+Usage: python pair_dataset.py data/exports/a_resume_job_pairs_fr.csv data/exports/a_resume_job_pairs_fr
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+RESUMES_FILE = "resumes.parquet"
+JOBS_FILE = "jobs.parquet"
+PAIR_COLUMNS = {"resume_id": np.int32, "job_id": np.int32, "score": np.float16}
+
+
+def save_dataset(directory, resumes, jobs, pairs):
+    """Writes a normalized dataset.
+
+    `resumes` / `jobs` are DataFrames or lists of dicts with at least
+    resume_id + resume_text / job_id + job_description; `pairs` maps
+    resume_id, job_id and score to equal-length arrays.
+    """
+    os.makedirs(directory, exist_ok=True)
+    resumes = pd.DataFrame(resumes).sort_values("resume_id")
+    jobs = pd.DataFrame(jobs).sort_values("job_id")
+    resumes = resumes.astype({"resume_id": np.int32}).drop(columns=["sampled_skills"], errors="ignore")
+    jobs = jobs.astype({"job_id": np.int32}).drop(columns=["sampled_skills"], errors="ignore")
+    resumes.to_parquet(os.path.join(directory, RESUMES_FILE), index=False)
+    jobs.to_parquet(os.path.join(directory, JOBS_FILE), index=False)
+    for column, dtype in PAIR_COLUMNS.items():
+        np.save(os.path.join(directory, column + ".npy"), np.asarray(pairs[column], dtype=dtype))
+
+
+def is_dataset(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, RESUMES_FILE))
+
+
+class PairDataset:
+    def __init__(self, directory):
+        self.directory = directory
+        self._resumes = None
+        self._jobs = None
+        self._columns = {}
+
+    def _column(self, name):
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.directory, name + ".npy"), mmap_mode="r")
+        return self._columns[name]
+
+    @property
+    def resume_ids(self):
+        return self._column("resume_id")
+
+    @property
+    def job_ids(self):
+        return self._column("job_id")
+
+    @property
+    def scores(self):
+        return self._column("score")
+
+    @property
+    def resumes(self):
+        """Resume table, sorted by resume_id."""
+        if self._resumes is None:
+            self._resumes = pd.read_parquet(os.path.join(self.directory, RESUMES_FILE))
+        return self._resumes
+
+    @property
+    def jobs(self):
+        """Job table, sorted by job_id."""
+        if self._jobs is None:
+            self._jobs = pd.read_parquet(os.path.join(self.directory, JOBS_FILE))
+        return self._jobs
+
+    def __len__(self):
+        return len(self.scores)
+
+    def resume_texts(self, resume_ids):
+        table = self.resumes
+        positions = np.searchsorted(table["resume_id"].to_numpy(), resume_ids)
+        return table["resume_text"].to_numpy()[positions]
+
+    def job_texts(self, job_ids):
+        table = self.jobs
+        positions = np.searchsorted(table["job_id"].to_numpy(), job_ids)
+        return table["job_description"].to_numpy()[positions]
+
+    def take(self, indices):
+        """Denormalized DataFrame (same columns as the pair CSVs) of the given pair indices."""
+        indices = np.asarray(indices)
+        resume_ids = np.asarray(self.resume_ids[indices])
+        job_ids = np.asarray(self.job_ids[indices])
+        return pd.DataFrame({
+            "resume_id": resume_ids,
+            "resume_text": self.resume_texts(resume_ids),
+            "job_id": job_ids,
+            "job_description": self.job_texts(job_ids),
+            # float16 storage: round back to the generators' two decimals
+            "score": np.round(np.asarray(self.scores[indices], dtype=np.float64), 2),
+        })
+
+    def iter_chunks(self, chunk_size=65536, indices=None):
+        """Yields denormalized DataFrames of at most `chunk_size` pairs."""
+        total = len(self) if indices is None else len(indices)
+        for start in range(0, total, chunk_size):
+            stop = min(start + chunk_size, total)
+            yield self.take(np.arange(start, stop) if indices is None else indices[start:stop])
+
+    def to_frame(self):
+        """The full denormalized DataFrame. Only for datasets that fit in memory."""
+        return self.take(np.arange(len(self)))
+
+
+def load_pairs(path):
+    """Denormalized pair DataFrame from either a pair CSV or a normalized dataset directory."""
+    if is_dataset(path):
+        return PairDataset(path).to_frame()
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def convert_pairs_csv(csv_path, directory, chunksize=100_000):
+    """Converts a pair CSV (resume_id, resume_text, job_id, job_description, score) to a normalized dataset."""
+    resumes, jobs, pairs = {}, {}, {column: [] for column in PAIR_COLUMNS}
+    for chunk in pd.read_csv(csv_path, encoding="utf-8-sig", chunksize=chunksize):
+        for resume_id, text in zip(chunk["resume_id"], chunk["resume_text"]):
+            resumes.setdefault(int(resume_id), text)
+        for job_id, text in zip(chunk["job_id"], chunk["job_description"]):
+            jobs.setdefault(int(job_id), text)
+        for column in PAIR_COLUMNS:
+            pairs[column].append(chunk[column].to_numpy(dtype=PAIR_COLUMNS[column]))
+
+    save_dataset(
+        directory,
+        [{"resume_id": i, "resume_text": text} for i, text in resumes.items()],
+        [{"job_id": i, "job_description": text} for i, text in jobs.items()],
+        {column: np.concatenate(parts) for column, parts in pairs.items()},
+    )
+    print(f"✅ {csv_path} -> {directory}: {len(resumes)} resumes, {len(jobs)} jobs, "
+          f"{sum(len(p) for p in pairs['score'])} pairs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv_path")
+    parser.add_argument("directory")
+    args = parser.parse_args()
+    convert_pairs_csv(args.csv_path, args.directory)
@@ -0,0 +1,131 @@
+"""
+reranker.py
+Two-stage ranking: bi-encoder retrieval of the top-k, then cross-encoder
+re-scoring of only those k (job, resume) pairs.
+
+The cross-encoder reads each job/resume pair jointly, so it ranks better
+than cosine similarity but costs one transformer pass per pair. Stage two
+therefore runs in batches under a per-request time budget: if the budget
+would be exceeded, the request returns the stage-one order unchanged.
+Each batch is checked against an estimate of its cost before it runs. The
+estimate (seconds per pair) comes from a warm-up run when get_reranker()
+loads the model, and is refined after every batch. A cross-encoder with no
+estimate yet is probed with a single pair first. Call get_reranker() at
+startup, so the load and warm-up are not charged to the first request.
+
+The cross-encoder defaults to the one fine-tuned by train_cross_encoder.py
+(models/ats_fr_reranker) when it exists, else to a multilingual MS MARCO
+cross-encoder. Set ATS_RERANKER_NAME to override.
+"""
+
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from ats_score_test import match_resumes
+
+BASE_RERANKER_NAME = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+FINETUNED_RERANKER_DIR = "models/ats_fr_reranker"
+
+WARM_UP_TEXT = (
+    "Développeur Python confirmé, 5 ans d'expérience en Django, SQL, Docker et AWS. "
+    "Conception d'API REST, tests automatisés, intégration continue, encadrement d'équipe. "
+) * 8
+
+_lock = threading.Lock()
+_rerankers = {}
+_seconds_per_pair = weakref.WeakKeyDictionary()   # reranker -> estimated cost of one pair
+
+
+def default_reranker_name():
+    name = os.environ.get("ATS_RERANKER_NAME")
+    if name:
+        return name
+    return FINETUNED_RERANKER_DIR if os.path.isdir(FINETUNED_RERANKER_DIR) else BASE_RERANKER_NAME
+
+
+def get_reranker(name=None, device=None):
+    """Shared CrossEncoder, loaded on first use (one instance per name and device)."""
+    name = name or default_reranker_name()
+    key = (name, device)
+    with _lock:
+        if key not in _rerankers:
+            from sentence_transformers import CrossEncoder
+
+            reranker = CrossEncoder(name, device=device)
+            warm_up(reranker)
+            _rerankers[key] = reranker
+        return _rerankers[key]
+
+
+def warm_up(reranker, batch_size=16):
+    """Runs one full batch of resume-length pairs and records the cost per pair."""
+    pairs = [(WARM_UP_TEXT, WARM_UP_TEXT)] * batch_size
+    reranker.predict(pairs[:1], show_progress_bar=False)   # first call: lazy init, not timed
+    start = time.perf_counter()
+    reranker.predict(pairs, batch_size=batch_size, show_progress_bar=False)
+    _seconds_per_pair[reranker] = (time.perf_counter() - start) / batch_size
+    return _seconds_per_pair[reranker]
+
+
+def _record_cost(reranker, seconds, n_pairs):
+    """Updates the cost estimate of a reranker (moving average, per pair)."""
+    observed = seconds / n_pairs
+    previous = _seconds_per_pair.get(reranker)
+    _seconds_per_pair[reranker] = observed if previous is None else 0.7 * previous + 0.3 * observed
+
+
+def rerank(job_des, candidates, reranker=None, batch_size=16, time_budget=None):
+    """Re-scores stage-one (resume, score) candidates with a cross-encoder.
+
+    Returns (results, reranked). When the next batch is expected to end past
+    `time_budget` (seconds), stops before it and returns the candidates in
+    their stage-one order with reranked=False.
+    """
+    if not candidates:
+        return list(candidates), True
+    if reranker is None:
+        reranker = get_reranker()
+    start = time.perf_counter()
+    scores, i = [], 0
+    while i < len(candidates):
+        per_pair = _seconds_per_pair.get(reranker)
+        # Without an estimate, a single pair is scored first to measure the cost.
+        size = batch_size if per_pair is not None or time_budget is None else 1
+        batch = candidates[i:i + size]
+        expected = (per_pair or 0.0) * len(batch)
+        if time_budget is not None and time.perf_counter() - start + expected > time_budget:
+            return list(candidates), False
+        batch_start = time.perf_counter()
+        pairs = [(job_des, resume) for resume, _ in batch]
+        scores.extend(reranker.predict(pairs, batch_size=batch_size, show_progress_bar=False).tolist())
+        _record_cost(reranker, time.perf_counter() - batch_start, len(batch))
+        i += len(batch)
+
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    return [(candidates[i][0], float(scores[i])) for i in order], True
+
+
+def match_resumes_reranked(job_des, resumes, keywords=None, k=50, top_n=None, reranker=None,
+                           time_budget=0.5, batch_size=16, **match_kwargs):
+    """Two-stage ranking: match_resumes top-k, then cross-encoder re-ranking of those k.
+
+    `time_budget` (seconds) covers both stages. Extra keyword arguments go to
+    match_resumes (store, index, candidates, model). Returns (results,
+    reranked): the top_n (resume, score) pairs, with cross-encoder scores if
+    reranked, else cosine scores in stage-one order.
+    """
+    # Loading (and warming up) the cross-encoder is not part of the request.
+    if reranker is None:
+        reranker = get_reranker()
+    start = time.perf_counter()
+    candidates = match_resumes(job_des, resumes, keywords, top_k=k, **match_kwargs)
+    # The budget covers the whole request: stage two gets what stage one left.
+    remaining = None if time_budget is None else time_budget - (time.perf_counter() - start)
+    if remaining is not None and remaining <= 0:
+        return candidates[:top_n], False
+    results, reranked = rerank(job_des, candidates, reranker, batch_size, remaining)
+    return results[:top_n], reranked
@@ -0,0 +1,181 @@
+"""
+resume_record.py
+Structured resume representation, built once at ingestion.
+
+A ResumeRecord (__slots__) holds what scoring needs from a resume:
+    sections     text of the Compétences / Expérience / Formation sections,
+                 split on the headers written by the dataset generators
+    skill_bits   packed bitset over the SkillExtractor vocabulary, taken from
+                 the Compétences section (the whole text if there is none)
+    years        years of experience ("N ans d'expérience"), -1 if not found
+
+ResumeMatrix stacks records into arrays: packed skill bits, years, and one
+normalized embedding matrix per section plus the full text. Scoring a job
+against it is array math only: skill overlap by popcount, section
+similarities by matrix-vector products.
+"""
+
+import re
+
+import numpy as np
+
+from job_cache import encode_job
+from skill_extractor_fallback import default_extractor, normalize_text
+
+SECTIONS = ("Compétences", "Expérience", "Formation")
+FULL_TEXT = "full"
+
+# Every header line written by the generators (accents optional, as PDF text
+# may lose them); a section ends at the next one.
+_HEADER = re.compile(
+    r"^\s*(pr[ée]nom/nom|ville|titre|profil|comp[ée]tences|exp[ée]rience|formation)\s*:\s*(.*)$",
+    re.IGNORECASE,
+)
+_SECTION_NAMES = {normalize_text(name): name for name in SECTIONS}
+_YEARS = re.compile(r"(\d+)\s*ans?\s+d['’]\s*exp[ée]rience", re.IGNORECASE)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Weights of the structured score; a section without text contributes 0.
+SCORE_WEIGHTS = {FULL_TEXT: 0.4, "Compétences": 0.15, "Expérience": 0.15, "skills": 0.3}
+
+
+def parse_sections(text):
+    """Maps each section of SECTIONS present in the text to its content."""
+    sections, current = {}, None
+    for line in text.splitlines():
+        match = _HEADER.match(line)
+        if match:
+            current = _SECTION_NAMES.get(normalize_text(match.group(1)))
+            if current is not None:
+                sections[current] = [match.group(2)] if match.group(2).strip() else []
+        elif current is not None and line.strip():
+            sections[current].append(line.strip())
+    return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+def parse_years(text):
+    years = [int(y) for y in _YEARS.findall(text)]
+    return max(years) if years else -1
+
+
+def skill_bits(text, extractor=None):
+    """Packed bitset (uint8) of the vocabulary skills found in the text."""
+    extractor = extractor or default_extractor()
+    bits = np.zeros(len(extractor.skills), dtype=bool)
+    bits[extractor.extract_ids(text)] = True
+    return np.packbits(bits)
+
+
+class ResumeRecord:
+    __slots__ = ("path", "text", "sections", "skill_bits", "years")
+
+    def __init__(self, path, text, sections, skill_bits, years):
+        self.path = path
+        self.text = text
+        self.sections = sections
+        self.skill_bits = skill_bits
+        self.years = years
+
+    @classmethod
+    def parse(cls, text, path=None, extractor=None):
+        sections = parse_sections(text)
+        skills_text = sections.get("Compétences") or text
+        return cls(path, text, sections, skill_bits(skills_text, extractor), parse_years(text))
+
+    def skills(self, extractor=None):
+        """Canonical names of the skills in the bitset."""
+        extractor = extractor or default_extractor()
+        ids = np.flatnonzero(np.unpackbits(self.skill_bits)[:len(extractor.skills)])
+        return [extractor.skills[i] for i in ids]
+
+
+def encode_sections(model, records, batch_size=64):
+    """Normalized embedding matrices {section: (n, dim)} of the full texts and of every section.
+
+    A record without a given section gets a zero row for it.
+    """
+    embeddings = {}
+    for name in (FULL_TEXT, *SECTIONS):
+        texts = [r.text if name == FULL_TEXT else r.sections.get(name, "") for r in records]
+        present = [i for i, text in enumerate(texts) if text.strip()]
+        vectors = None
+        if present:
+            encoded = model.encode(
+                [texts[i] for i in present], batch_size=batch_size,
+                normalize_embeddings=True, convert_to_numpy=True,
+            )
+            vectors = np.zeros((len(records), encoded.shape[1]), dtype=np.float32)
+            vectors[present] = encoded
+        embeddings[name] = vectors
+    dim = next((v.shape[1] for v in embeddings.values() if v is not None), 0)
+    return {name: v if v is not None else np.zeros((len(records), dim), dtype=np.float32)
+            for name, v in embeddings.items()}
+
+
+class ResumeMatrix:
+    def __init__(self, paths, skill_bits, years, embeddings):
+        self.paths = list(paths)
+        self.skill_bits = skill_bits        # (n, ceil(vocab / 8)) uint8
+        self.years = years                  # (n,) int16, -1 if unknown
+        self.embeddings = embeddings        # {FULL_TEXT or section: (n, dim) float32}
+
+    def __len__(self):
+        return len(self.paths)
+
+    @classmethod
+    def from_records(cls, records, model=None, batch_size=64):
+        records = list(records)
+        if model is None:
+            from model_registry import get_model
+            model = get_model()
+        return cls(
+            [r.path for r in records],
+            np.stack([r.skill_bits for r in records]) if records else np.zeros((0, 0), dtype=np.uint8),
+            np.array([r.years for r in records], dtype=np.int16),
+            encode_sections(model, records, batch_size),
+        )
+
+    def save(self, filename):
+        np.savez(
+            filename, paths=np.array(self.paths, dtype=str), skill_bits=self.skill_bits, years=self.years,
+            **{f"emb_{name}": matrix for name, matrix in self.embeddings.items()},
+        )
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            embeddings = {key[4:]: data[key] for key in data.files if key.startswith("emb_")}
+            return cls(data["paths"].tolist(), data["skill_bits"], data["years"], embeddings)
+
+    def skill_overlap(self, job_bits):
+        """Share of the job's skills present in each resume."""
+        required = int(_POPCOUNT[job_bits].sum())
+        if required == 0:
+            return np.zeros(len(self), dtype=np.float32)
+        return _POPCOUNT[self.skill_bits & job_bits].sum(axis=1, dtype=np.float32) / required
+
+    def scores(self, job_bits, job_embedding, weights=None, min_years=None):
+        """Weighted sum of section similarities and skill overlap; -inf below min_years."""
+        weights = SCORE_WEIGHTS if weights is None else weights
+        job_embedding = np.asarray(job_embedding, dtype=np.float32)
+        total = np.zeros(len(self), dtype=np.float32)
+        for name, weight in weights.items():
+            if name == "skills":
+                total += weight * self.skill_overlap(job_bits)
+            elif weight:
+                total += weight * (self.embeddings[name] @ job_embedding)
+        if min_years is not None:
+            total[self.years < min_years] = -np.inf
+        return total
+
+
+def job_features(job_description, model, extractor=None):
+    """(skill bits, normalized embedding) of a job description, the inputs of ResumeMatrix.scores.
+
+    The skills come from its "Compétences requises" (the whole text if there is
+    none); the embedding is cached per model by job_cache.
+    """
+    from inverted_index import required_skills
+
+    skills_text = ", ".join(required_skills(job_description)) or job_description
+    return skill_bits(skills_text, extractor), encode_job(model, job_description)
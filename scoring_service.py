@@ -0,0 +1,293 @@
+"""
+scoring_service.py
+Long-running local HTTP service around resume scoring and keyword extraction.
+
+The embedding model is loaded once at startup and kept warm. Concurrent
+requests do not call the model one by one: a MicroBatcher collects the texts
+of every request arriving within `max_wait` seconds (10 ms by default) and
+encodes them in one shared batch, with duplicate texts encoded once. Job
+embeddings and extracted keywords are kept in the shared job cache
+(job_cache.py), so a repeated job is neither re-encoded nor re-sent to Ollama.
+
+Endpoints (JSON):
+    POST /match     {"job_description", "resumes", "keywords"?, "extract_keywords"?, "top_k"?}
+    POST /keywords  {"job_description"}
+    GET  /health
+    GET  /stats     request latency percentiles, batching and job cache counters
+
+Usage: python scoring_service.py [--host 127.0.0.1] [--port 8000] [--max-wait-ms 10]
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ann_index import top_k_indices
+from job_cache import embedding_key, get_job_cache
+from model_registry import get_model, model_id
+from ollama_service import extract_keywords
+
+
+class MicroBatcher:
+    def __init__(self, model, max_wait=0.01, max_batch_size=256):
+        self.model = model
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.unique_texts = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def encode(self, texts):
+        """Blocks until the normalized embeddings of `texts` are ready."""
+        future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        pending, count = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            pending.append(item)
+            count += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            pending = self._collect(first)
+
+            # Every pending future must be resolved, whatever goes wrong with the batch.
+            try:
+                positions = {}
+                for texts, _ in pending:
+                    for text in texts:
+                        positions.setdefault(text, len(positions))
+                embeddings = self.model.encode(
+                    list(positions),
+                    batch_size=min(len(positions), self.max_batch_size),
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                )
+                results = [embeddings[[positions[text] for text in texts]] for texts, _ in pending]
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(pending)
+            self.texts += sum(len(texts) for texts, _ in pending)
+            self.unique_texts += len(positions)
+            for (_, future), result in zip(pending, results):
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "unique_texts": self.unique_texts,
+            "mean_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+class LatencyStats:
+    """Per-endpoint request counts and latency percentiles over the last `window` requests."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, endpoint, seconds, ok=True):
+        with self._lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self):
+        with self._lock:
+            snapshot = {endpoint: np.array(values) for endpoint, values in self._latencies.items()}
+            counts, errors = dict(self._counts), dict(self._errors)
+        summary = {}
+        for endpoint, values in snapshot.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            summary[endpoint] = {
+                "count": counts[endpoint],
+                "errors": errors.get(endpoint, 0),
+                "mean_ms": round(float(values.mean()) * 1000, 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+            }
+        return summary
+
+
+def _check_text(value, name):
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string, got {type(value).__name__}")
+    return value
+
+
+def _check_texts(values, name):
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"{name} must be a list of strings")
+    return values
+
+
+class ScoringService:
+    def __init__(self, model=None, max_wait=0.01, max_batch_size=256):
+        self.model = model or get_model()
+        self.model.encode(["warm-up"])
+        self.batcher = MicroBatcher(self.model, max_wait, max_batch_size)
+        self.latency = LatencyStats()
+        self.started = time.time()
+
+    def match(self, payload):
+        # Checked before anything is queued: one bad text would fail the whole shared batch.
+        job = _check_text(payload["job_description"], "job_description")
+        resumes = _check_texts(payload["resumes"], "resumes")
+        keywords = payload.get("keywords")
+        if keywords is not None:
+            _check_texts(keywords, "keywords")
+        if keywords is None and payload.get("extract_keywords"):
+            keywords = extract_keywords(job)
+        if keywords:
+            job = job + " " + " ".join(keywords)
+
+        key = embedding_key(self.model, job)
+        job_embedding = get_job_cache().get(key) if key else None
+        if job_embedding is None:
+            embeddings = self.batcher.encode([job] + list(resumes))
+            job_embedding, resume_embeddings = embeddings[0], embeddings[1:]
+            if key:
+                get_job_cache().set(key, job_embedding.copy())
+        elif resumes:
+            resume_embeddings = self.batcher.encode(resumes)
+        else:
+            resume_embeddings = np.zeros((0, len(job_embedding)), dtype=np.float32)
+        scores = resume_embeddings @ job_embedding
+        top = top_k_indices(scores, payload.get("top_k") or len(resumes))
+        return {
+            "keywords": keywords or [],
+            "results": [
+                {"rank": rank, "index": int(i), "score": round(float(scores[i]), 4), "resume": resumes[i]}
+                for rank, i in enumerate(top, start=1)
+            ],
+        }
+
+    def keywords(self, payload):
+        return {"keywords": extract_keywords(_check_text(payload["job_description"], "job_description"))}
+
+    def health(self):
+        return {"status": "ok", "model": model_id(), "uptime_s": round(time.time() - self.started, 1)}
+
+    def stats(self):
+        return {
+            "latency": self.latency.summary(),
+            "batching": self.batcher.stats(),
+            "job_cache": get_job_cache().stats(),
+        }
+
+
+def make_handler(service):
+    routes = {
+        ("POST", "/match"): service.match,
+        ("POST", "/keywords"): service.keywords,
+        ("GET", "/health"): lambda payload: service.health(),
+        ("GET", "/stats"): lambda payload: service.stats(),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _handle(self, method):
+            start = time.perf_counter()
+            path = self.path.split("?")[0]
+            route = routes.get((method, path))
+            if route is None:
+                return self._send(404, {"error": f"No route for {method} {self.path}"})
+            status = 200
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length)) if length else {}
+                body = route(payload)
+            except (KeyError, TypeError, ValueError) as e:
+                status, body = 400, {"error": f"{type(e).__name__}: {e}"}
+            except Exception as e:
+                status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+            self._send(status, body)
+            service.latency.record(path, time.perf_counter() - start, ok=status == 200)
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=8000, max_wait=0.01, max_batch_size=256):
+    service = ScoringService(max_wait=max_wait, max_batch_size=max_batch_size)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    print(f"✅ Scoring service ready on http://{host}:{port} (model: {model_id()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.max_wait_ms / 1000, args.max_batch_size)
@@ -0,0 +1,168 @@
+"""
+skill_extractor_fallback.py
+Deterministic skill extraction used when the LLM is slow or unavailable.
+
+Skills from a curated lexicon are found in a single pass over the text with an
+Aho-Corasick automaton. Text and lexicon are normalized the same way (accents
+stripped, case folded), so "Sécurité", "securite" and "SÉCURITÉ" all match.
+Matches must start and end on a word boundary ("Java" does not match inside
+"JavaScript").
+"""
+
+import re
+import unicodedata
+from collections import deque
+
+# Canonical skill -> extra spellings. Seeded from the DOMAINS skill lists of the
+# dataset generators and SKILLS of generate_synthetic_cv_fr.py.
+SKILLS_LEXICON = {
+    # Informatique
+    "Python": [],
+    "Django": [],
+    "Docker": [],
+    "SQL": [],
+    "Git": [],
+    "TensorFlow": [],
+    "Linux": [],
+    "API REST": ["REST API", "REST APIs", "API RESTful"],
+    "Java": [],
+    "JavaScript": [],
+    "Node.js": ["NodeJS"],
+    "React": ["ReactJS", "React.js"],
+    "Kubernetes": ["K8s"],
+    "PyTorch": [],
+    "Pandas": [],
+    "NumPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "CI/CD": ["CI CD"],
+    "Agile": ["méthodes agiles"],
+    "Scrum": [],
+    "Cisco": [],
+    "Bases de données": ["base de données"],
+    "Machine Learning": ["apprentissage automatique"],
+    # Marketing
+    "SEO": [],
+    "Google Ads": [],
+    "Réseaux sociaux": [],
+    "Branding": [],
+    "Analytics": ["Google Analytics"],
+    "CRM": [],
+    # Finance
+    "Excel": [],
+    "SAP": [],
+    "Fiscalité": [],
+    "Reporting": [],
+    "IFRS": [],
+    "Analyse financière": [],
+    # Ressources Humaines
+    "Paie": [],
+    "Recrutement": [],
+    "Formation": [],
+    "Communication": [],
+    "Gestion RH": [],
+    # Santé
+    "Soins": [],
+    "Hygiène": [],
+    "Travail en équipe": [],
+    "Dossier patient": [],
+    # Industrie
+    "Maintenance": [],
+    "Sécurité": [],
+    "Automatisme": [],
+    "Lean": [],
+    "ISO9001": ["ISO 9001"],
+}
+
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+_APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'", "\u00a0": " "})
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Lowercases, strips accents and collapses whitespace."""
+    text = unicodedata.normalize("NFKD", text.translate(_APOSTROPHES))
+    text = _COMBINING_MARKS.sub("", text).casefold()
+    return _SPACES.sub(" ", text)
+
+
+class SkillExtractor:
+    def __init__(self, lexicon=None):
+        lexicon = SKILLS_LEXICON if lexicon is None else lexicon
+        # Automaton: per state, its transitions, failure link and matched skills.
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self.skills = list(lexicon)
+        for skill_id, skill in enumerate(self.skills):
+            for spelling in [skill, *lexicon[skill]]:
+                pattern = normalize_text(spelling).strip()
+                if pattern:
+                    self._add(pattern, skill_id)
+        self._link()
+
+    def _add(self, pattern, skill_id):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((skill_id, len(pattern), pattern[0].isalnum(), pattern[-1].isalnum()))
+
+    def _link(self):
+        # Breadth-first, so a state's failure target is always linked before it.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def extract_ids(self, text):
+        """Lexicon indices of the skills found in the text, in order of first match."""
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        state = 0
+        last = len(text) - 1
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for skill_id, length, left_word, right_word in out[state]:
+                if skill_id in found:
+                    continue
+                start = end - length + 1
+                if left_word and start > 0 and text[start - 1].isalnum():
+                    continue
+                if right_word and end < last and text[end + 1].isalnum():
+                    continue
+                found[skill_id] = start
+        return list(found)
+
+    def extract(self, text):
+        """Canonical names of the skills found in the text."""
+        return [self.skills[i] for i in self.extract_ids(text)]
+
+
+_default_extractor = None
+
+
+def default_extractor():
+    """Shared SkillExtractor over SKILLS_LEXICON, built on first use."""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor()
+    return _default_extractor
+
+
+def extract_skills(text):
+    return default_extractor().extract(text)
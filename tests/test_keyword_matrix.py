@@ -0,0 +1,28 @@
+"""
+Tests of the keyword tokenizer of ats_score_test.keyword_matrix.
+"""
+
+import numpy as np
+
+from ats_score_test import keyword_matrix
+
+
+def hits_of(resumes, keywords):
+    hits, weights = keyword_matrix(resumes, keywords)
+    return np.asarray(hits @ weights).ravel()
+
+
+def test_symbol_keywords_do_not_match_french_elision():
+    resumes = ["Je suis motivé, c'est certain.", "Expert C++ et C#."]
+    assert hits_of(resumes, ["C++", "C#"]).tolist() == [0.0, 2.0]
+
+
+def test_symbol_keywords_are_distinct_terms():
+    resumes = ["Développeur C#", "Développeur C++", "Langage C"]
+    assert hits_of(resumes, ["C++"]).tolist() == [0.0, 1.0, 0.0]
+    assert hits_of(resumes, ["C"]).tolist() == [0.0, 0.0, 1.0]
+
+
+def test_dotted_and_multiword_keywords():
+    resumes = ["Node.js, React et bases de données SQL.", "Python. Django."]
+    assert hits_of(resumes, ["Node.js", "bases de données", "Python", "Django"]).tolist() == [2.0, 2.0]
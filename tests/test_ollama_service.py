@@ -0,0 +1,183 @@
+"""
+Tests of ollama_service against a local stub of the Ollama REST API.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ollama_service import KeywordCache, OllamaClient, extract_keywords_many
+
+
+class StubOllama(ThreadingHTTPServer):
+    """Answers /api/generate after `delay` seconds with `answer` (a string, or a
+    function of the prompt). With `drop_connections`, the connection is closed
+    after each answer without telling the client, like an idle keep-alive timeout."""
+
+    daemon_threads = True
+
+    def __init__(self, answer="Python, Django , SQL,", delay=0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.answer = answer
+        self.delay = delay
+        self.drop_connections = False
+        self.requests = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(body)
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        answer = server.answer(body["prompt"]) if callable(server.answer) else server.answer
+        with server.lock:
+            server.in_flight -= 1
+        data = json.dumps({"response": answer}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if server.drop_connections:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = StubOllama()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = KeywordCache(str(tmp_path / "keywords.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_generate_reuses_one_keep_alive_connection(stub):
+    client = OllamaClient(stub.url)
+    try:
+        for i in range(3):
+            assert client.extract_keywords(f"Poste {i}") == ["Python", "Django", "SQL"]
+    finally:
+        client.close()
+    assert len(stub.requests) == 3
+    assert len(stub.connections) == 1
+    assert stub.requests[0]["model"] == client.model
+    assert stub.requests[0]["stream"] is False
+
+
+def test_reconnects_after_server_closes_idle_connection(stub):
+    stub.drop_connections = True
+    client = OllamaClient(stub.url)
+    try:
+        client.extract_keywords("Poste A")
+        time.sleep(0.05)
+        assert client.extract_keywords("Poste B") == ["Python", "Django", "SQL"]
+    finally:
+        client.close()
+    assert len(stub.requests) == 2
+    assert len(stub.connections) == 2
+
+
+def test_cache_hit_skips_the_server(stub, cache):
+    client = OllamaClient(stub.url, cache=cache)
+    try:
+        first = client.extract_keywords("Développeur Python")
+        second = client.extract_keywords("Développeur Python")
+    finally:
+        client.close()
+    assert first == second == ["Python", "Django", "SQL"]
+    assert len(stub.requests) == 1
+
+
+def test_cache_is_persistent_and_keyed_by_model(stub, cache, tmp_path):
+    client = OllamaClient(stub.url, cache=cache)
+    client.extract_keywords("Data engineer")
+    client.close()
+
+    reopened = KeywordCache(str(tmp_path / "keywords.sqlite"))
+    try:
+        client = OllamaClient(stub.url, cache=reopened)
+        assert client.extract_keywords("Data engineer") == ["Python", "Django", "SQL"]
+        assert len(stub.requests) == 1
+        other_model = OllamaClient(stub.url, model="mistral", cache=reopened)
+        other_model.extract_keywords("Data engineer")
+        assert len(stub.requests) == 2
+        other_model.close()
+        client.close()
+    finally:
+        reopened.close()
+
+
+def test_cache_entries_expire_after_ttl(stub, tmp_path):
+    cache = KeywordCache(str(tmp_path / "ttl.sqlite"), ttl=0.1)
+    client = OllamaClient(stub.url, cache=cache)
+    try:
+        client.extract_keywords("Offre expirée")
+        client.extract_keywords("Offre expirée")
+        assert len(stub.requests) == 1
+        time.sleep(0.15)
+        client.extract_keywords("Offre expirée")
+        assert len(stub.requests) == 2
+    finally:
+        client.close()
+        cache.close()
+
+
+def test_async_batch_respects_concurrency_cap(stub, cache):
+    stub.delay = 0.1
+    jobs = [f"Offre asynchrone {i}" for i in range(8)]
+    results = asyncio.run(extract_keywords_many(jobs, max_concurrency=3, base_url=stub.url, cache=cache))
+    assert results == [["Python", "Django", "SQL"]] * len(jobs)
+    assert len(stub.requests) == len(jobs)
+    assert 1 < stub.max_in_flight <= 3
+
+
+def test_async_batch_keeps_input_order(stub, cache):
+    def answer(prompt):
+        # Later jobs answer first, so completion order differs from input order.
+        i = int(re.search(r"Offre ordonnée (\d+)", prompt).group(1))
+        time.sleep(0.02 * (5 - i))
+        return f"Skill{i}"
+
+    stub.answer = answer
+    jobs = [f"Offre ordonnée {i}" for i in range(5)]
+    results = asyncio.run(extract_keywords_many(jobs, max_concurrency=5, base_url=stub.url, cache=cache))
+    assert results == [[f"Skill{i}"] for i in range(5)]
+
+
+def test_unreachable_server_falls_back_to_lexicon(cache):
+    jobs = ["Compétences requises : Python, SQL (serveur arrêté)"]
+    results = asyncio.run(
+        extract_keywords_many(jobs, max_concurrency=1, base_url="http://127.0.0.1:9", cache=cache)
+    )
+    assert "Python" in results[0] and "SQL" in results[0]
@@ -0,0 +1,201 @@
+"""
+token_cache.py
+Pre-tokenization cache for fine-tuning runs.
+
+Each resume appears in hundreds of pairs, and every epoch (and every run)
+used to re-tokenize it. A TokenCache tokenizes each unique text once and
+keeps the token ids on disk:
+    tokens.i32    every token id sequence, concatenated (memory-mapped)
+    index.json    tokenizer name
+    keys.log      append-only log, "key length" per sequence (ids are written first)
+
+Keys are content_key(text, name) as in the EmbeddingStore, where the name
+covers the tokenizer and max sequence length. install_token_cache() replaces
+the model's smart_batching_collate (used by model.old_fit), so training
+batches are padded straight from the cached ids. As with the EmbeddingStore,
+a single process writes to the cache: pretokenize before training with
+several DataLoader workers. Appends only add lines to keys.log, so
+pretokenizing millions of texts stays linear.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from embedding_store import KEYS_FILE, append_key_log, content_key, read_key_log, write_json
+
+TOKENS_FILE = "tokens.i32"
+INDEX_FILE = "index.json"
+CACHE_ROOT = "data/cache/tokens"
+
+
+def token_cache_name(model):
+    """Cache name of a SentenceTransformer: tokenizer and max sequence length."""
+    return f"{model.tokenizer.name_or_path}#max{model.max_seq_length}"
+
+
+def token_cache_dir(model, root=CACHE_ROOT):
+    digest = hashlib.sha256(token_cache_name(model).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(root, digest)
+
+
+def _tokenize_fn(model):
+    """Tokenizes texts exactly like training would, returning one id list per text."""
+    preprocess = getattr(model, "preprocess", None) or model.tokenize
+
+    def tokenize(texts):
+        features = preprocess(texts)
+        ids = features["input_ids"].numpy()
+        lengths = features["attention_mask"].numpy().sum(axis=1)
+        # Right padding: the real tokens are the first `length` ids.
+        return [row[:length] for row, length in zip(ids, lengths)]
+
+    return tokenize
+
+
+class TokenCache:
+    def __init__(self, directory, name):
+        self.directory = directory
+        self.name = name
+        self.tokens_path = os.path.join(directory, TOKENS_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.keys_path = os.path.join(directory, KEYS_FILE)
+        self.keys = []
+        self.lengths = []
+        self._rows = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._tokens = None
+        self._log_size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["name"] != name:
+                raise ValueError(f"Token cache {directory} was built for {meta['name']}, not {name}.")
+            lines, self._log_size = read_key_log(self.keys_path)
+            self.keys = [fields[0] for fields in lines]
+            self.lengths = [int(fields[1]) for fields in lines]
+            self._rows = {key: row for row, key in enumerate(self.keys)}
+            self._offsets = np.concatenate([[0], np.cumsum(self.lengths, dtype=np.int64)])
+        self._save_index()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def tokens(self):
+        """Memory-mapped int32 array of every cached token id."""
+        if self._tokens is None and self._offsets[-1]:
+            self._tokens = np.memmap(self.tokens_path, dtype=np.int32, mode="r", shape=(int(self._offsets[-1]),))
+        return self._tokens
+
+    def rows_for(self, texts, tokenize, batch_size=1024):
+        """Returns the cache row of every text, tokenizing only the texts not cached yet."""
+        keys = [content_key(text, self.name) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        missing_keys, missing_texts = list(missing), list(missing.values())
+        for start in range(0, len(missing_texts), batch_size):
+            self._append(
+                missing_keys[start:start + batch_size],
+                tokenize(missing_texts[start:start + batch_size]),
+            )
+        return [self._rows[key] for key in keys]
+
+    def token_ids(self, row):
+        return self.tokens[self._offsets[row]:self._offsets[row + 1]]
+
+    def _append(self, keys, id_lists):
+        self._tokens = None
+        lengths = [len(ids) for ids in id_lists]
+        with open(self.tokens_path, "ab") as f:
+            # Sequences written after the last logged key (e.g. after a crash) are cut off.
+            f.truncate(int(self._offsets[-1]) * 4)
+            f.write(np.concatenate(id_lists).astype(np.int32).tobytes())
+
+        # Keys go to the log only once their ids are written.
+        self._log_size = append_key_log(
+            self.keys_path, [f"{key} {length}" for key, length in zip(keys, lengths)], self._log_size
+        )
+        for key, length in zip(keys, lengths):
+            self._rows[key] = len(self.keys)
+            self.keys.append(key)
+            self.lengths.append(length)
+        self._offsets = np.concatenate([self._offsets, self._offsets[-1] + np.cumsum(lengths, dtype=np.int64)])
+
+    def _save_index(self):
+        write_json(self.index_path, {"name": self.name})
+
+
+def open_token_cache(model, root=CACHE_ROOT):
+    return TokenCache(token_cache_dir(model, root), token_cache_name(model))
+
+
+def pretokenize(model, texts, cache, batch_size=1024):
+    """Tokenizes the texts missing from the cache. Returns the number of new texts."""
+    before = len(cache)
+    cache.rows_for(list(texts), _tokenize_fn(model), batch_size)
+    return len(cache) - before
+
+
+def pretokenize_dataset(model, path, cache, chunk_size=65536):
+    """Pretokenizes every unique resume and job text of a pair CSV or pair_dataset directory."""
+    from pair_dataset import PairDataset, is_dataset
+    from training_data import iter_split_frames
+
+    if is_dataset(path):
+        dataset = PairDataset(path)
+        added = pretokenize(model, dataset.resumes["resume_text"], cache)
+        added += pretokenize(model, dataset.jobs["job_description"], cache)
+    else:
+        added = 0
+        for frame in iter_split_frames(path, chunk_size=chunk_size):
+            added += pretokenize(model, frame["resume_text"].unique(), cache)
+            added += pretokenize(model, frame["job_description"].unique(), cache)
+    print(f"🔤 Token cache {cache.directory}: {added} new texts, {len(cache)} total")
+    return added
+
+
+def install_token_cache(model, cache):
+    """Makes model.old_fit collate training batches from cached token ids."""
+    import torch
+
+    tokenize = _tokenize_fn(model)
+    pad_id = model.tokenizer.pad_token_id or 0
+    # Non-tensor entries of the features (e.g. "modality") and optional token_type_ids.
+    probe = (getattr(model, "preprocess", None) or model.tokenize)(["probe"])
+    extras = {key: value for key, value in probe.items() if not isinstance(value, torch.Tensor)}
+    with_token_types = "token_type_ids" in probe
+
+    def features_for(texts):
+        rows = cache.rows_for(texts, tokenize)
+        sequences = [cache.token_ids(row) for row in rows]
+        width = max(len(ids) for ids in sequences)
+        input_ids = np.full((len(sequences), width), pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(sequences), width), dtype=np.int64)
+        for i, ids in enumerate(sequences):
+            input_ids[i, :len(ids)] = ids
+            attention_mask[i, :len(ids)] = 1
+        features = {
+            "input_ids": torch.from_numpy(input_ids),
+            "attention_mask": torch.from_numpy(attention_mask),
+            **extras,
+        }
+        if with_token_types:
+            features["token_type_ids"] = torch.zeros_like(features["input_ids"])
+        return features
+
+    def smart_batching_collate(batch):
+        texts = [example.texts for example in batch]
+        sentence_features = [features_for(list(column)) for column in zip(*texts)]
+        labels = torch.tensor([example.label for example in batch])
+        return sentence_features, labels
+
+    model.smart_batching_collate = smart_batching_collate
+    return model
@@ -0,0 +1,116 @@
+"""
+train_cross_encoder.py
+Fine-tunes the cross-encoder used by reranker.py on the resume–job pairs.
+
+Steps:
+1. Locate the resume–job dataset (pair CSV or pair_dataset directory)
+2. Hash-based train/val/test split, streamed from disk (same split as train_french_ats_model.py)
+3. Fine-tune CrossEncoder (one relevance score per (job, resume) pair)
+4. Evaluate on validation/test: correlation and per-job ranking metrics
+5. Save fine-tuned re-ranker
+"""
+
+import os
+import time
+
+import numpy as np
+from scipy.stats import pearsonr, spearmanr
+from sentence_transformers import CrossEncoder, InputExample
+from torch.utils.data import DataLoader
+
+from evaluation import ranking_metrics
+from reranker import BASE_RERANKER_NAME, FINETUNED_RERANKER_DIR
+from training_data import PairStream, count_pairs, load_split
+
+# ------------------------------------------------------------
+# 1. Load dataset
+# ------------------------------------------------------------
+# A pair CSV or a normalized pair_dataset directory (see pair_dataset.py)
+DATA_FILE = "resume_job_pairs_fr.csv"
+MAX_EVAL_PAIRS = 20_000
+
+if not os.path.exists(DATA_FILE):
+    raise FileNotFoundError(
+        f"{DATA_FILE} not found. Run generate_french_ats_dataset.py first."
+    )
+
+# ------------------------------------------------------------
+# 2. Split train/validation/test
+# ------------------------------------------------------------
+class JobResumeStream(PairStream):
+    """PairStream with the cross-encoder input order: (job, resume)."""
+
+    def __iter__(self):
+        for example in super().__iter__():
+            resume, job = example.texts
+            yield InputExample(texts=[job, resume], label=example.label)
+
+
+train_data = JobResumeStream(DATA_FILE, split="train", shuffle=True)
+val_df = load_split(DATA_FILE, "val", max_pairs=MAX_EVAL_PAIRS)
+test_df = load_split(DATA_FILE, "test", max_pairs=MAX_EVAL_PAIRS)
+
+print(f"✅ Split: {len(train_data)} train / {count_pairs(DATA_FILE, 'val')} val / {count_pairs(DATA_FILE, 'test')} test")
+
+# ------------------------------------------------------------
+# 3. Load model + DataLoader
+# ------------------------------------------------------------
+model_name = BASE_RERANKER_NAME
+model = CrossEncoder(model_name, num_labels=1, max_length=512)
+print(f"🚀 Loaded base cross-encoder: {model_name}")
+
+train_dataloader = DataLoader(train_data, batch_size=16)
+
+# ------------------------------------------------------------
+# 4. Training configuration
+# ------------------------------------------------------------
+num_epochs = 1
+warmup_steps = int(len(train_dataloader) * num_epochs * 0.1)
+output_dir = FINETUNED_RERANKER_DIR
+
+print(f"🛠 Starting training for {num_epochs} epoch(s)...")
+# old_fit iterates the DataLoader batch by batch (labels in [0, 1], BCE loss);
+# fit (sentence-transformers >= 4) would first copy every pair into memory.
+fit = getattr(model, "old_fit", model.fit)
+fit(
+    train_dataloader=train_dataloader,
+    epochs=num_epochs,
+    warmup_steps=warmup_steps,
+    show_progress_bar=True,
+    output_path=output_dir,
+)
+model.save(output_dir)
+print(f"💾 Re-ranker saved to {output_dir}")
+
+# ------------------------------------------------------------
+# 5. Evaluate on validation and test
+# ------------------------------------------------------------
+def evaluate_reranker(model, dataframe, label_name="Validation", k=10):
+    pairs = list(zip(dataframe["job_description"], dataframe["resume_text"]))
+    labels = dataframe["score"].to_numpy(dtype=np.float64)
+    start = time.perf_counter()
+    scores = model.predict(pairs, batch_size=64, show_progress_bar=True)
+    elapsed = time.perf_counter() - start
+
+    metrics = {
+        "pearson": float(pearsonr(scores, labels)[0]),
+        "spearman": float(spearmanr(scores, labels).correlation),
+    }
+    metrics.update(ranking_metrics(dataframe["job_id"].to_numpy(), np.asarray(scores), labels, k))
+    print(f"📈 {label_name}: {len(pairs)} pairs, {len(pairs) / elapsed:.1f} pairs/s")
+    for name, value in metrics.items():
+        if name != "jobs":
+            print(f"    {name:<10}: {value:.4f}")
+    return metrics
+
+
+val_metrics = evaluate_reranker(model, val_df, "Validation")
+test_metrics = evaluate_reranker(model, test_df, "Test")
+
+# ------------------------------------------------------------
+# 6. Final summary
+# ------------------------------------------------------------
+print("✅ Training complete!")
+print(f"📊 Test Spearman: {test_metrics['spearman']:.3f}")
+print(f"📊 Test NDCG@10 / MRR: {test_metrics['ndcg@10']:.3f} / {test_metrics['mrr']:.3f}")
+print(f"🧩 Fine-tuned re-ranker stored in: {output_dir}")
@@ -3,87 +3,82 @@ train_french_ats_model.py
 Full pipeline to fine-tune a French resume–job similarity model.
 
 Steps:
-1. Load (or generate) resume–job dataset
-2. Split into train/val/test
+1. Locate the resume–job dataset (pair CSV or pair_dataset directory)
+2. Hash-based train/val/test split, streamed from disk
 3. Fine-tune SentenceTransformer
 4. Evaluate on validation/test
 5. Save fine-tuned model
 """
 
 import os
-import random
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sentence_transformers import SentenceTransformer, InputExample, losses, util
+from sentence_transformers import SentenceTransformer, losses
 from torch.utils.data import DataLoader
-import torch
+
+from evaluation import evaluate_frame, print_report
+from token_cache import install_token_cache, open_token_cache, pretokenize_dataset
+from training_data import PairStream, count_pairs, export_splits, load_split
 
 # ------------------------------------------------------------
 # 1. Load dataset
 # ------------------------------------------------------------
+# A pair CSV or a normalized pair_dataset directory (see pair_dataset.py)
 DATA_FILE = "resume_job_pairs_fr.csv"
+MAX_EVAL_PAIRS = 20_000
 
 if not os.path.exists(DATA_FILE):
     raise FileNotFoundError(
         f"{DATA_FILE} not found. Run generate_french_ats_dataset.py first."
     )
 
-df = pd.read_csv(DATA_FILE)
-print(f"📄 Loaded {len(df)} resume–job pairs.")
-
 # ------------------------------------------------------------
 # 2. Split train/validation/test
 # ------------------------------------------------------------
-train_df, temp_df = train_test_split(df, test_size=0.2, random_state=42)
-val_df, test_df = train_test_split(temp_df, test_size=0.5, random_state=42)
-
-print(f"✅ Split: {len(train_df)} train / {len(val_df)} val / {len(test_df)} test")
+# 80/10/10 split by a hash of (resume_id, job_id): the training pairs are
+# streamed from disk, only the (capped) evaluation splits are loaded.
+train_data = PairStream(DATA_FILE, split="train", shuffle=True)
+val_df = load_split(DATA_FILE, "val", max_pairs=MAX_EVAL_PAIRS)
+test_df = load_split(DATA_FILE, "test", max_pairs=MAX_EVAL_PAIRS)
 
-train_df.to_csv("train_pairs.csv", index=False, encoding="utf-8-sig")
-val_df.to_csv("val_pairs.csv", index=False, encoding="utf-8-sig")
-test_df.to_csv("test_pairs.csv", index=False, encoding="utf-8-sig")
+print(f"📄 {count_pairs(DATA_FILE)} resume–job pairs.")
+print(f"✅ Split: {len(train_data)} train / {count_pairs(DATA_FILE, 'val')} val / {count_pairs(DATA_FILE, 'test')} test")
 
-# ------------------------------------------------------------
-# 3. Convert to SentenceTransformer InputExamples
-# ------------------------------------------------------------
-def df_to_examples(dataframe):
-    return [
-        InputExample(
-            texts=[row["resume_text"], row["job_description"]],
-            label=float(row["score"]),
-        )
-        for _, row in dataframe.iterrows()
-    ]
+export_splits(DATA_FILE)   # train_pairs.csv / val_pairs.csv / test_pairs.csv, written chunk by chunk
 
-train_examples = df_to_examples(train_df)
-val_examples = df_to_examples(val_df)
-test_examples = df_to_examples(test_df)
-
-print(f"🧠 Prepared {len(train_examples)} training examples.")
+print(f"🧠 Streaming {len(train_data)} training examples.")
 
 # ------------------------------------------------------------
-# 4. Load model (multilingual or French)
+# 3. Load model (multilingual or French)
 # ------------------------------------------------------------
 # You can replace this with another French-friendly model (like camembert)
 model_name = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 model = SentenceTransformer(model_name)
 print(f"🚀 Loaded base model: {model_name}")
 
+# Tokenize every unique resume/job text once (reused by later runs), then
+# collate training batches from the cached token ids.
+token_cache = open_token_cache(model)
+pretokenize_dataset(model, DATA_FILE, token_cache)
+install_token_cache(model, token_cache)
+
 # ------------------------------------------------------------
-# 5. DataLoader + Loss
+# 4. DataLoader + Loss
 # ------------------------------------------------------------
-train_dataloader = DataLoader(train_examples, shuffle=True, batch_size=16)
+# PairStream shuffles through its own buffer (DataLoader shuffle needs a map-style dataset).
+train_dataloader = DataLoader(train_data, batch_size=16)
 train_loss = losses.CosineSimilarityLoss(model)
 
 # ------------------------------------------------------------
-# 6. Training configuration
+# 5. Training configuration
 # ------------------------------------------------------------
 num_epochs = 2
 warmup_steps = int(len(train_dataloader) * num_epochs * 0.1)
 output_dir = "./models/ats_fr_similarity"
 
 print(f"🛠 Starting training for {num_epochs} epochs...")
-model.fit(
+# old_fit (sentence-transformers >= 3) iterates the DataLoader batch by batch;
+# fit would first copy every pair into a datasets.Dataset.
+fit = getattr(model, "old_fit", model.fit)
+fit(
     train_objectives=[(train_dataloader, train_loss)],
     epochs=num_epochs,
     warmup_steps=warmup_steps,
@@ -94,30 +89,26 @@ model.fit(
 print(f"💾 Model saved to {output_dir}")
 
 # ------------------------------------------------------------
-# 7. Evaluate on validation and test
+# 6. Evaluate on validation and test
 # ------------------------------------------------------------
-def evaluate_model(model, examples, label_name="Validation"):
-    with torch.no_grad():
-        resume_texts = [ex.texts[0] for ex in examples]
-        job_texts = [ex.texts[1] for ex in examples]
-        labels = torch.tensor([ex.label for ex in examples])
-
-        emb1 = model.encode(resume_texts, convert_to_tensor=True, show_progress_bar=True)
-        emb2 = model.encode(job_texts, convert_to_tensor=True, show_progress_bar=True)
-
-        sims = util.cos_sim(emb1, emb2).diagonal()
-        corr = torch.corrcoef(torch.stack([sims, labels]))[0, 1].item()
-        print(f"📈 {label_name} correlation between cosine sim and labels: {corr:.3f}")
-        return corr
+# Unique texts are encoded once and only paired similarities are computed
+# (see evaluation.py), with per-job ranking metrics alongside correlation.
+def evaluate_model(model, dataframe, label_name="Validation"):
+    metrics = evaluate_frame(model, dataframe)
+    print_report(metrics, label_name)
+    return metrics
 
 
-val_corr = evaluate_model(model, val_examples, "Validation")
-test_corr = evaluate_model(model, test_examples, "Test")
+val_metrics = evaluate_model(model, val_df, "Validation")
+test_metrics = evaluate_model(model, test_df, "Test")
+val_corr = val_metrics["pearson"]
+test_corr = test_metrics["pearson"]
 
 # ------------------------------------------------------------
-# 8. Final summary
+# 7. Final summary
 # ------------------------------------------------------------
 print("✅ Training complete!")
 print(f"📊 Validation correlation: {val_corr:.3f}")
 print(f"📊 Test correlation: {test_corr:.3f}")
+print(f"📊 Test NDCG@10 / MRR: {test_metrics['ndcg@10']:.3f} / {test_metrics['mrr']:.3f}")
 print(f"🧩 Fine-tuned model stored in: {output_dir}")
@@ -0,0 +1,230 @@
+"""
+training_data.py
+Streams resume–job training pairs from disk instead of building a list of
+InputExample for the whole dataset.
+
+- Splits are hash-based: a pair belongs to train / val / test according to a
+  hash of (resume_id, job_id, seed), so every split can be read in one pass
+  without materializing or shuffling the whole dataset first.
+- PairStream is a torch IterableDataset reading the pairs chunk by chunk
+  (pair CSV or pair_dataset directory), mixing them through a shuffle buffer
+  and yielding InputExample objects. It has a __len__, so DataLoader and
+  model.old_fit know the number of steps per epoch.
+- count_pairs() counts the rows of a split: straight from the memory-mapped id
+  columns for a pair_dataset, and once per file for a CSV (cached next to it).
+- load_split(max_pairs=...) draws a uniform, reproducible sample of a split
+  from the whole file (a second pair hash), not its first rows.
+- export_splits() writes train/val/test pair CSVs, chunk by chunk.
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+from torch.utils.data import IterableDataset, get_worker_info
+
+from pair_dataset import PairDataset, is_dataset
+
+SPLITS = {"train": (0.0, 0.8), "val": (0.8, 0.9), "test": (0.9, 1.0)}
+SPLIT_SEED = 42
+SAMPLE_SALT = 0x5EED5A3B1E
+FRAME_COLUMNS = ["resume_id", "resume_text", "job_id", "job_description", "score"]
+
+
+def _mix64(x):
+    """splitmix64 finalizer over a uint64 array."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def pair_hash(resume_ids, job_ids, seed=SPLIT_SEED):
+    """Uniform value in [0, 1) for every (resume_id, job_id) pair."""
+    key = (np.asarray(resume_ids).astype(np.uint64) << np.uint64(32)) | np.asarray(job_ids).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        return (_mix64(key ^ np.uint64(seed)) >> np.uint64(11)) / float(2 ** 53)
+
+
+def split_mask(resume_ids, job_ids, split, seed=SPLIT_SEED):
+    """Boolean mask of the pairs that belong to `split` ("train", "val", "test" or None for all)."""
+    if split is None:
+        return np.ones(len(np.asarray(resume_ids)), dtype=bool)
+    low, high = SPLITS[split]
+    u = pair_hash(resume_ids, job_ids, seed)
+    return (u >= low) & (u < high)
+
+
+def _csv_chunks(path, chunk_size, columns=None):
+    return pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size, usecols=columns)
+
+
+def count_pairs(path, split=None, seed=SPLIT_SEED, chunk_size=200_000):
+    """Number of pairs of a split, without loading the texts."""
+    if is_dataset(path):
+        dataset = PairDataset(path)
+        if split is None:
+            return len(dataset)
+        return sum(
+            int(split_mask(dataset.resume_ids[i:i + chunk_size], dataset.job_ids[i:i + chunk_size], split, seed).sum())
+            for i in range(0, len(dataset), chunk_size)
+        )
+
+    # A CSV has to be parsed once (texts span several lines); the counts are
+    # cached next to it and reused while the file is unchanged.
+    stat = os.stat(path)
+    cache_path = path + ".counts.json"
+    cache_key = f"{stat.st_size}:{stat.st_mtime_ns}:{seed}"
+    counts = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            counts = json.load(f)
+    if counts.get("key") != cache_key:
+        counts = {"key": cache_key, "all": 0, **{name: 0 for name in SPLITS}}
+        for chunk in _csv_chunks(path, chunk_size, ["resume_id", "job_id"]):
+            counts["all"] += len(chunk)
+            for name in SPLITS:
+                counts[name] += int(split_mask(chunk["resume_id"], chunk["job_id"], name, seed).sum())
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(counts, f)
+    return counts["all" if split is None else split]
+
+
+def iter_split_frames(path, split=None, seed=SPLIT_SEED, chunk_size=65536, shuffle_chunks=False, rng=None):
+    """Yields denormalized DataFrame chunks of the pairs of a split.
+
+    With shuffle_chunks, a pair_dataset is read in random chunk order (a CSV
+    can only be read front to back).
+    """
+    if is_dataset(path):
+        dataset = PairDataset(path)
+        starts = list(range(0, len(dataset), chunk_size))
+        if shuffle_chunks:
+            (rng or random).shuffle(starts)
+        for start in starts:
+            stop = min(start + chunk_size, len(dataset))
+            mask = split_mask(dataset.resume_ids[start:stop], dataset.job_ids[start:stop], split, seed)
+            if mask.any():
+                yield dataset.take(start + np.flatnonzero(mask))
+    else:
+        for chunk in _csv_chunks(path, chunk_size):
+            chunk = chunk[split_mask(chunk["resume_id"], chunk["job_id"], split, seed)]
+            if len(chunk):
+                yield chunk
+
+
+def load_split(path, split, seed=SPLIT_SEED, max_pairs=None):
+    """The pairs of a split as one DataFrame (for evaluation).
+
+    With max_pairs, a uniform sample of that many pairs spread over the whole
+    file: the pairs with the smallest pair_hash under a second seed, so the
+    sample is the same on every run.
+    """
+    total = count_pairs(path, split, seed) if max_pairs is not None else None
+    if total is None or total <= max_pairs:
+        frames = list(iter_split_frames(path, split, seed))
+        if not frames:
+            return pd.DataFrame(columns=FRAME_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    # Keep a little more than the expected share, then the max_pairs smallest hashes.
+    threshold = min(1.0, 1.1 * max_pairs / total + 1e-3)
+    frames, keys = [], []
+    for frame in iter_split_frames(path, split, seed):
+        u = pair_hash(frame["resume_id"], frame["job_id"], seed ^ SAMPLE_SALT)
+        keep = u < threshold
+        frames.append(frame[keep])
+        keys.append(u[keep])
+    df = pd.concat(frames, ignore_index=True)
+    chosen = np.sort(np.argsort(np.concatenate(keys), kind="stable")[:max_pairs])
+    return df.iloc[chosen].reset_index(drop=True)
+
+
+def export_splits(path, directory=".", seed=SPLIT_SEED, chunk_size=65536):
+    """Writes {train,val,test}_pairs.csv (utf-8-sig) with the pairs of each split; returns their paths."""
+    paths = {name: os.path.join(directory, f"{name}_pairs.csv") for name in SPLITS}
+    files = {name: open(file_path, "w", encoding="utf-8-sig", newline="") for name, file_path in paths.items()}
+    try:
+        for f in files.values():
+            pd.DataFrame(columns=FRAME_COLUMNS).to_csv(f, index=False)
+        for frame in iter_split_frames(path, None, seed, chunk_size):
+            u = pair_hash(frame["resume_id"], frame["job_id"], seed)
+            for name, (low, high) in SPLITS.items():
+                part = frame[(u >= low) & (u < high)]
+                if len(part):
+                    part[FRAME_COLUMNS].to_csv(files[name], index=False, header=False)
+    finally:
+        for f in files.values():
+            f.close()
+    return paths
+
+
+def shuffle_buffer(items, buffer_size, rng):
+    """Approximate shuffle of a stream: emits a random element of a buffer of `buffer_size` items."""
+    buffer = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = item
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+class PairStream(IterableDataset):
+    """Iterable dataset of InputExample(texts=[resume_text, job_description], label=score)."""
+
+    def __init__(self, path, split="train", shuffle=True, buffer_size=10_000, chunk_size=65536, seed=SPLIT_SEED):
+        self.path = path
+        self.split = split
+        self.shuffle = shuffle
+        self.buffer_size = buffer_size
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.epoch = 0
+        self._len = None
+
+    def __len__(self):
+        if self._len is None:
+            self._len = count_pairs(self.path, self.split, self.seed)
+        return self._len
+
+    def _examples(self, rng):
+        from sentence_transformers import InputExample
+
+        worker = get_worker_info()
+        frames = iter_split_frames(
+            self.path, self.split, self.seed, self.chunk_size, shuffle_chunks=self.shuffle, rng=rng
+        )
+        for n, frame in enumerate(frames):
+            # With several DataLoader workers, each one reads every num_workers-th chunk.
+            if worker is not None and n % worker.num_workers != worker.id:
+                continue
+            for resume, job, score in zip(frame["resume_text"], frame["job_description"], frame["score"]):
+                yield InputExample(texts=[resume, job], label=float(score))
+
+    def set_epoch(self, epoch):
+        """Epoch of the next iteration, for training loops that track it themselves."""
+        self.epoch = epoch
+
+    def __iter__(self):
+        # Same chunk order in every worker, a new order every epoch.
+        worker = get_worker_info()
+        if worker is None:
+            rng = random.Random(self.seed + self.epoch)
+        else:
+            # A worker iterates a copy of the dataset, so self.epoch never advances
+            # in the parent. DataLoader draws a new base seed every epoch (from the
+            # torch seed) and gives worker i the seed base + i.
+            base_seed = worker.seed - worker.id
+            rng = random.Random((self.seed + self.epoch) * 2 ** 64 + base_seed)
+        self.epoch += 1
+        examples = self._examples(rng)
+        if self.shuffle:
+            worker_id = worker.id if worker is not None else 0
+            examples = shuffle_buffer(examples, self.buffer_size, random.Random(rng.getrandbits(64) + worker_id))
+        return examples
@@ -1,18 +1,91 @@
+import io
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 import pdfplumber
 from docx import Document
 
+# PDF backend: "auto" (pypdfium2 text dump, pdfplumber if it yields nothing),
+# "pypdfium2", "pdfminer" or "pdfplumber" (layout-aware, slowest).
+# Read from the environment so process-pool workers share the setting.
+PDF_BACKEND = os.environ.get("ATS_PDF_BACKEND", "auto")
+PDF_MAX_PAGES = int(os.environ.get("ATS_PDF_MAX_PAGES", "0")) or None
+
 def read_txt(path):
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         return f.read()
 
-def read_pdf(path):
+def read_pdf_pdfplumber(path, max_pages=None):
     text = []
     with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
+        for page in pdf.pages[:max_pages]:
             text.append(page.extract_text() or "")
     return "\n".join(text)
 
+def read_pdf_pypdfium2(path, max_pages=None):
+    import pypdfium2 as pdfium
+
+    text = []
+    pdf = pdfium.PdfDocument(path)
+    try:
+        for i in range(min(len(pdf), max_pages or len(pdf))):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return "\n".join(text)
+
+def read_pdf_pdfminer(path, max_pages=None):
+    """pdfminer without layout analysis: characters in content-stream order.
+
+    Much cheaper than pdfplumber, but words run together on PDFs that place
+    glyphs individually instead of emitting spaces.
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    output = io.StringIO()
+    manager = PDFResourceManager(caching=True)
+    device = TextConverter(manager, output, laparams=None)
+    interpreter = PDFPageInterpreter(manager, device)
+    try:
+        with open(path, "rb") as f:
+            for page in PDFPage.get_pages(f, maxpages=max_pages or 0):
+                interpreter.process_page(page)
+                output.write("\n")
+    finally:
+        device.close()
+    return output.getvalue()
+
+PDF_READERS = {
+    "pypdfium2": read_pdf_pypdfium2,
+    "pdfminer": read_pdf_pdfminer,
+    "pdfplumber": read_pdf_pdfplumber,
+}
+
+def read_pdf(path, backend=None, max_pages=None):
+    """Extracts the text of the first `max_pages` pages (all pages if None).
+
+    With the "auto" backend, pypdfium2's text dump is tried first and
+    pdfplumber is used when it is not installed, fails or finds no text.
+    """
+    backend = backend or PDF_BACKEND
+    max_pages = max_pages or PDF_MAX_PAGES
+    if backend != "auto":
+        return PDF_READERS[backend](path, max_pages)
+
+    try:
+        text = read_pdf_pypdfium2(path, max_pages)
+    except Exception:
+        text = ""
+    if text.strip():
+        return text
+    return read_pdf_pdfplumber(path, max_pages)
+
 def read_docx(path):
     doc = Document(path)
     return "\n".join([p.text for p in doc.paragraphs])
@@ -27,3 +100,132 @@ def extract_text_from_file(path):
         return read_docx(path)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
+
+def extractor_settings(path):
+    """Settings that change the text extracted from `path`, part of the ExtractionCache key."""
+    if os.path.splitext(path)[1].lower() == ".pdf":
+        return f"pdf:{PDF_BACKEND}:{PDF_MAX_PAGES or 'all'}"
+    return ""
+
+def extract_text_cached(path, cache):
+    """extract_text_from_file through an ExtractionCache: only new or modified files are parsed."""
+    from extraction_cache import file_fingerprint
+
+    settings = extractor_settings(path)
+    text = cache.lookup(path, settings)
+    if text is None:
+        fingerprint = file_fingerprint(path)
+        text = extract_text_from_file(path)
+        cache.store(path, text, fingerprint, settings)
+    return text
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+def iter_resume_files(directory):
+    """Yields the paths of supported resume files under a directory, in sorted order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.join(root, name)
+
+def _extract_safely(path, fingerprint=False):
+    """(path, text, error, fingerprint): with `fingerprint`, the file is also
+    hashed here in the worker, before parsing, for the ExtractionCache."""
+    from extraction_cache import file_fingerprint
+
+    try:
+        info = file_fingerprint(path) if fingerprint else None
+        return path, extract_text_from_file(path), None, info
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}", None
+
+def iter_extract_texts(paths, max_workers=None, max_in_flight=None, cache=None):
+    """Parses files over a process pool and yields (path, text, error) as they finish.
+
+    Results come in completion order. At most `max_in_flight` files are
+    submitted at once, so memory stays bounded however many paths are given.
+    `error` is None on success, otherwise `text` is None. With an
+    ExtractionCache, files with the cached size and mtime are yielded straight
+    from the cache; the others are hashed and parsed in the workers, and their
+    texts are added to the cache.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max_workers
+    pool = ProcessPoolExecutor(max_workers=max_workers)
+    pending = set()
+    def finished(future):
+        path, text, error, fingerprint = future.result()
+        if cache is not None and error is None:
+            cache.store(path, text, fingerprint, extractor_settings(path))
+        return path, text, error
+
+    try:
+        for path in paths:
+            if cache is not None:
+                try:
+                    text = cache.lookup(path, extractor_settings(path), content=False)
+                except OSError as e:
+                    # Same report as a file that fails in a worker, without stopping the others.
+                    yield path, None, f"{type(e).__name__}: {e}"
+                    continue
+                if text is not None:
+                    yield path, text, None
+                    continue
+            pending.add(pool.submit(_extract_safely, path, cache is not None))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finished(future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield finished(future)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def iter_directory_texts(directory, max_workers=None, max_in_flight=None, cache=None):
+    """Parallel ingestion of every supported file under a directory."""
+    return iter_extract_texts(iter_resume_files(directory), max_workers, max_in_flight, cache)
+
+def iter_resume_records(directory, max_workers=None, max_in_flight=None, cache=None):
+    """Parallel ingestion that yields (path, ResumeRecord, error) instead of raw text."""
+    from resume_record import ResumeRecord
+
+    for path, text, error in iter_directory_texts(directory, max_workers, max_in_flight, cache):
+        yield path, (ResumeRecord.parse(text, path) if error is None else None), error
+
+def build_resume_matrix(directory, model=None, max_workers=None, cache=None):
+    """Ingests a directory into a ResumeMatrix (sections, skills, years, section embeddings).
+
+    Files that fail to parse are reported and left out.
+    """
+    from resume_record import ResumeMatrix
+
+    records = []
+    for path, record, error in iter_resume_records(directory, max_workers, cache=cache):
+        if error is not None:
+            print(f"⚠️ {path}: {error}")
+            continue
+        records.append(record)
+    records.sort(key=lambda r: r.path)
+    return ResumeMatrix.from_records(records, model)
+
+def index_directory(directory, index=None, max_workers=None, cache=None):
+    """Ingests a directory into an InvertedIndex (a new one, or `index` to extend it).
+
+    Returns (paths, index) where paths[i - first_id] is the file of resume id i;
+    resumes arriving later can be indexed with index.add(text).
+    """
+    from inverted_index import InvertedIndex
+
+    if index is None:
+        index = InvertedIndex()
+    paths = []
+    for path, text, error in iter_directory_texts(directory, max_workers, cache=cache):
+        if error is not None:
+            print(f"⚠️ {path}: {error}")
+            continue
+        index.add(text)
+        paths.append(path)
+    return paths, index
@@ -0,0 +1,236 @@
+"""
+vector_compression.py
+Compressed storage of normalized resume embeddings, scored directly in
+compressed form, with an optional exact rescore of the top candidates.
+
+A CompressedIndex chains an optional reducer and a codec:
+    reducers   PCAReducer(dim)        projection on the top principal components
+               TruncateReducer(dim)   first `dim` dimensions (Matryoshka-style)
+    codecs     Float16Codec           2 bytes per dimension
+               Int8Codec              1 byte per dimension, per-dimension scale
+               PQCodec(m)             product quantization, m bytes per vector
+Reduced vectors are re-normalized, so scores stay cosine similarities.
+With `rescore`, the best k * rescore candidates of the compressed scan are
+re-scored exactly against the full-precision vectors and the exact top-k is
+returned. Those are read from disk, never kept in memory: a memory-mapped
+matrix (e.g. EmbeddingStore.matrix, which build() uses when given one) or any
+`full` row source passed to build(). Without one, search() returns the
+compressed ranking.
+CompressedIndex has the same build/search interface as ann_index.IVFIndex,
+so it can be passed as `index` to match_resumes.
+"""
+
+import numpy as np
+
+from ann_index import top_k_indices
+
+CHUNK_SIZE = 65536
+
+
+def _normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def _sample(vectors, max_size, seed):
+    if len(vectors) <= max_size:
+        return np.asarray(vectors, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    return np.asarray(vectors[np.sort(rng.choice(len(vectors), max_size, replace=False))], dtype=np.float32)
+
+
+def chunked_dot(codes, query, chunk_size=CHUNK_SIZE):
+    """codes @ query, widening `chunk_size` rows to float32 at a time."""
+    scores = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), chunk_size):
+        scores[start:start + chunk_size] = codes[start:start + chunk_size].astype(np.float32) @ query
+    return scores
+
+
+class TruncateReducer:
+    def __init__(self, dim):
+        self.dim = dim
+
+    def fit(self, vectors):
+        return self
+
+    def transform(self, vectors):
+        return _normalize(np.asarray(vectors, dtype=np.float32)[:, :self.dim])
+
+    def nbytes(self):
+        return 0
+
+
+class PCAReducer:
+    def __init__(self, dim, max_train_size=100_000, seed=42):
+        self.dim = dim
+        self.max_train_size = max_train_size
+        self.seed = seed
+        self.mean = None
+        self.components = None
+
+    def fit(self, vectors):
+        sample = _sample(vectors, self.max_train_size, self.seed)
+        self.mean = sample.mean(axis=0)
+        _, _, vt = np.linalg.svd(sample - self.mean, full_matrices=False)
+        self.components = vt[:self.dim].astype(np.float32)
+        return self
+
+    def transform(self, vectors):
+        return _normalize((np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T)
+
+    def nbytes(self):
+        return self.mean.nbytes + self.components.nbytes
+
+
+class Float16Codec:
+    def fit(self, vectors):
+        return self
+
+    def encode(self, vectors):
+        return np.asarray(vectors, dtype=np.float16)
+
+    def scores(self, codes, query):
+        return chunked_dot(codes, query)
+
+    def bytes_per_vector(self, dim):
+        return 2 * dim
+
+
+class Int8Codec:
+    """Symmetric scalar quantization with one scale per dimension."""
+
+    def __init__(self, max_train_size=100_000, seed=42):
+        self.max_train_size = max_train_size
+        self.seed = seed
+        self.scale = None
+
+    def fit(self, vectors):
+        sample = _sample(vectors, self.max_train_size, self.seed)
+        self.scale = np.maximum(np.abs(sample).max(axis=0), 1e-12) / 127
+        return self
+
+    def encode(self, vectors):
+        return np.clip(np.rint(np.asarray(vectors, dtype=np.float32) / self.scale), -127, 127).astype(np.int8)
+
+    def scores(self, codes, query):
+        # (codes * scale) @ query == codes @ (scale * query)
+        return chunked_dot(codes, (query * self.scale).astype(np.float32))
+
+    def bytes_per_vector(self, dim):
+        return dim
+
+
+class PQCodec:
+    """Product quantization: m sub-vectors, each replaced by one of 256 centroids."""
+
+    def __init__(self, m=16, n_centroids=256, n_iter=15, max_train_size=50_000, seed=42):
+        self.m = m
+        self.n_centroids = n_centroids
+        self.n_iter = n_iter
+        self.max_train_size = max_train_size
+        self.seed = seed
+        self.codebooks = None   # (m, n_centroids, dim / m)
+
+    def _split(self, vectors):
+        n, dim = vectors.shape
+        if dim % self.m:
+            raise ValueError(f"Dimension {dim} is not divisible by m={self.m}.")
+        return vectors.reshape(n, self.m, dim // self.m)
+
+    def _assign(self, sub, codebook):
+        # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2)
+        return np.argmax(sub @ codebook.T - 0.5 * (codebook ** 2).sum(axis=1), axis=1)
+
+    def fit(self, vectors):
+        rng = np.random.default_rng(self.seed)
+        subs = self._split(_sample(vectors, self.max_train_size, self.seed))
+        k = min(self.n_centroids, len(subs))
+        codebooks = []
+        for j in range(self.m):
+            sub = subs[:, j]
+            codebook = sub[rng.choice(len(sub), k, replace=False)].copy()
+            for _ in range(self.n_iter):
+                assign = self._assign(sub, codebook)
+                counts = np.bincount(assign, minlength=k)
+                sums = np.zeros_like(codebook)
+                np.add.at(sums, assign, sub)
+                filled = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, None]
+            codebooks.append(codebook)
+        self.codebooks = np.stack(codebooks).astype(np.float32)
+        return self
+
+    def encode(self, vectors):
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for start in range(0, len(vectors), CHUNK_SIZE):
+            subs = self._split(np.asarray(vectors[start:start + CHUNK_SIZE], dtype=np.float32))
+            for j in range(self.m):
+                codes[start:start + CHUNK_SIZE, j] = self._assign(subs[:, j], self.codebooks[j])
+        return codes
+
+    def scores(self, codes, query):
+        # Lookup table of every sub-query against every centroid, then one gather per vector.
+        lut = np.einsum("mkd,md->mk", self.codebooks, self._split(query[None, :])[0])
+        scores = np.empty(len(codes), dtype=np.float32)
+        columns = np.arange(self.m)
+        for start in range(0, len(codes), CHUNK_SIZE):
+            scores[start:start + CHUNK_SIZE] = lut[columns, codes[start:start + CHUNK_SIZE]].sum(axis=1)
+        return scores
+
+    def bytes_per_vector(self, dim):
+        return self.m
+
+
+class CompressedIndex:
+    def __init__(self, codec=None, reducer=None, rescore=4):
+        self.codec = codec or Float16Codec()
+        self.reducer = reducer
+        self.rescore = rescore
+        self.codes = None
+        self.full = None
+
+    def build(self, vectors, full=None):
+        """Compresses a (n, dim) matrix of normalized vectors (an array or a memmap).
+
+        `full` serves the rows to rescore (full[ids] -> float32 rows), e.g. a
+        memmap or an EmbeddingStore row lookup. It defaults to `vectors` when
+        that is a memmap; an in-memory array is never kept.
+        """
+        train = _sample(vectors, 100_000, 42)
+        if self.reducer is not None:
+            self.reducer.fit(train)
+            train = self.reducer.transform(train)
+        self.codec.fit(train)
+        parts = []
+        for start in range(0, len(vectors), CHUNK_SIZE):
+            block = np.asarray(vectors[start:start + CHUNK_SIZE], dtype=np.float32)
+            if self.reducer is not None:
+                block = self.reducer.transform(block)
+            parts.append(self.codec.encode(block))
+        self.codes = np.concatenate(parts)
+        if full is None and isinstance(vectors, np.memmap):
+            full = vectors
+        # Only a reference to on-disk rows: the rescored candidates are read on demand.
+        self.full = full
+        return self
+
+    def bytes_per_vector(self):
+        return self.codes.nbytes / max(len(self.codes), 1)
+
+    def approximate_scores(self, query):
+        query = np.asarray(query, dtype=np.float32)
+        if self.reducer is not None:
+            query = self.reducer.transform(query[None, :])[0]
+        return self.codec.scores(self.codes, query)
+
+    def search(self, query, k, rescore=None):
+        """Top-k (ids, scores) by compressed scores, exactly rescored if enabled."""
+        rescore = self.rescore if rescore is None else rescore
+        scores = self.approximate_scores(query)
+        if not rescore or self.full is None:
+            ids = top_k_indices(scores, k)
+            return ids, scores[ids]
+        candidates = np.sort(top_k_indices(scores, k * rescore))
+        exact = np.asarray(self.full[candidates], dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+        best = top_k_indices(exact, k)
+        return candidates[best], exact[best]